@@ -1,5 +1,50 @@
-from game import Boom
+import argparse
+import json
+import startup
+from render import BACKENDS
+
+with startup.phase("imports"):
+    from game import Boom
 
 if __name__ == "__main__":
-    boom = Boom()
-    boom.main_loop()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Boom")
+    parser.add_argument("--startup-times", action="store_true", help="print how long each startup phase took")
+    parser.add_argument("--record", metavar="PATH", help="record every tick of input to PATH")
+    parser.add_argument("--seed", type=int, help="seed for the recorded session")
+    parser.add_argument("--replay", metavar="PATH", help="replay a recording made with --record")
+    parser.add_argument("--headless", action="store_true", help="replay without a window as fast as possible")
+    parser.add_argument("--host", action="store_true", help="host a network game; the remote player is ship 2")
+    parser.add_argument("--join", metavar="ADDRESS", help="join a network game hosted at ADDRESS")
+    parser.add_argument("--port", type=int, default=47800, help="UDP port of the network game")
+    parser.add_argument("--latency", type=float, default=0, help="simulated one-way latency in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="simulated extra random latency in ms")
+    parser.add_argument("--loss", type=float, default=0, help="simulated packet loss between 0 and 1")
+    parser.add_argument("--event-log", metavar="PATH", help="write gameplay events to PATH for offline analysis")
+    parser.add_argument("--window", metavar="WxH", help="window size, e.g. 1600x1200; the game itself stays 800x600")
+    parser.add_argument("--split", action="store_true", help="run the simulation in its own process")
+    parser.add_argument("--native", action="store_true",
+                        help="draw sprites at their native size and upscale the world once per frame")
+    parser.add_argument("--renderer", choices=BACKENDS, default="surface", help="how frames are presented")
+    args = parser.parse_args()
+    if args.headless and not args.replay:
+        parser.error("--headless requires --replay")
+
+    Boom.report_startup = args.startup_times
+    Boom.record_path = args.record
+    Boom.replay_path = args.replay
+    Boom.seed = args.seed
+    Boom.net_role = "host" if args.host else "join" if args.join else None
+    Boom.net_address = (args.join or "0.0.0.0", args.port)
+    Boom.net_latency, Boom.net_jitter, Boom.net_loss = args.latency, args.jitter, args.loss
+    Boom.event_log_path = args.event_log
+    Boom.window_size = tuple(int(value) for value in args.window.lower().split("x")) if args.window else None
+    Boom.render_backend = args.renderer
+    Boom.native_render = args.native
+    Boom.split_mode = args.split
+
+    if args.replay and args.headless:
+        boom = Boom(headless=True)
+        print(json.dumps(boom.replay.run(boom), indent=2))
+    else:
+        boom = Boom()
+        boom.main_loop()
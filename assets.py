@@ -0,0 +1,305 @@
+import json
+import os
+import pygame.transform
+from collections import OrderedDict
+from pygame.image import load
+from pygame.transform import rotozoom
+from pygame import Surface
+from pygame import SRCALPHA
+from pygame.font import Font
+
+
+SPRITES = (
+    ("PlayerBullet", True, 3),
+    ("Bullet", True, 3),
+    ("SlowBullet", True, 3),
+    ("EnemyNormal", True, 3),
+    ("EnemySlow", True, 3),
+    ("HealthShard", True, 2),
+    ("FireRateShard", True, 2),
+)
+
+ANIMATED_SPRITES = (
+    ("Spaceship", 8, 13, 15, 3),
+)
+
+
+ATLAS = "atlas"
+
+
+def sprite_path(name):
+    return f"Assets/{name}.png"
+
+
+def atlas_index_path(name=ATLAS):
+    return f"Assets/{name}.json"
+
+
+def atlas_key(name, scale_multi, frame=None):
+    if frame is None:
+        return f"{name}@{scale_multi}"
+    return f"{name}:{frame}@{scale_multi}"
+
+
+def scale_sprite(loaded_sprite, scale_multi):
+    if scale_multi != 1:
+        x, y = loaded_sprite.get_size()
+        loaded_sprite = pygame.transform.scale(loaded_sprite, (x*scale_multi, y*scale_multi))
+    return loaded_sprite
+
+
+def cut_frame(sheet, frame, x, y, scale_multi):
+    image = Surface((x, y), SRCALPHA)
+    image.blit(sheet, (0, 0), ((frame * x), 0, x, y))
+    return pygame.transform.scale(image, (x*scale_multi, y * scale_multi))
+
+
+class AssetRegistry:
+    def __init__(self):
+        self.atlas = None
+        self.atlas_rects = None
+        self.files = {}
+        self.sheets = {}
+        self.sprites = {}
+        self.animated_sprites = {}
+        self.sources = {}
+        self.hits = 0
+        self.misses = 0
+
+    def sprite(self, name, with_alpha=True, scale_multi=1):
+        key = (name, scale_multi, with_alpha)
+        sprite = self.sprites.get(key)
+
+        if sprite is not None:
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        loaded_sprite = self.from_atlas(atlas_key(name, scale_multi))
+
+        if loaded_sprite is None:
+            loaded_sprite = scale_sprite(self.load_file(name), scale_multi)
+            sprite = loaded_sprite.convert_alpha() if with_alpha else loaded_sprite.convert()
+        else:
+            sprite = loaded_sprite if with_alpha else loaded_sprite.convert()
+
+        self.sprites[key] = sprite
+        self.sources[sprite] = key
+        return sprite
+
+    def sheet(self, name):
+        sheet = self.sheets.get(name)
+
+        if sheet is None:
+            sheet = self.load_file(name).convert_alpha()
+            self.sheets[name] = sheet
+
+        return sheet
+
+    def animated_sprite(self, name, frame, x, y, scale_multi=1):
+        key = (name, frame, x, y, scale_multi)
+        image = self.animated_sprites.get(key)
+
+        if image is not None:
+            self.hits += 1
+            return image
+
+        self.misses += 1
+        image = self.from_atlas(atlas_key(name, scale_multi, frame))
+
+        if image is None:
+            image = cut_frame(self.sheet(name), frame, x, y, scale_multi)
+            image.set_colorkey((0, 0, 0))
+            image = image.convert_alpha()
+
+        self.animated_sprites[key] = image
+        self.sources[image] = key
+        return image
+
+    def native(self, sprite):
+        key = self.sources[sprite]
+
+        if len(key) == 3:
+            name, scale_multi, with_alpha = key
+            return self.sprite(name, with_alpha, 1)
+
+        name, frame, x, y, scale_multi = key
+        return self.animated_sprite(name, frame, x, y, 1)
+
+    def load_file(self, name):
+        loaded_file = self.files.pop(name, None)
+        return load(sprite_path(name)) if loaded_file is None else loaded_file
+
+    def read_atlas_index(self):
+        if self.atlas_rects is None:
+            self.atlas_rects = {}
+            if os.path.exists(atlas_index_path()):
+                with open(atlas_index_path(), 'r') as file:
+                    self.atlas_rects = json.load(file)
+
+        return self.atlas_rects
+
+    def from_atlas(self, key):
+        rect = self.read_atlas_index().get(key)
+
+        if rect is None:
+            return None
+        if self.atlas is None:
+            self.atlas = self.load_file(ATLAS).convert_alpha()
+
+        return self.atlas.subsurface(rect)
+
+    def decode(self, sprites=SPRITES, animated_sprites=ANIMATED_SPRITES):
+        if self.read_atlas_index():
+            self.files[ATLAS] = load(sprite_path(ATLAS))
+            return
+
+        for name in {sprite[0] for sprite in (*sprites, *animated_sprites)}:
+            self.files[name] = load(sprite_path(name))
+
+    def preload(self, sprites=SPRITES, animated_sprites=ANIMATED_SPRITES):
+        for name, with_alpha, scale_multi in sprites:
+            self.sprite(name, with_alpha, scale_multi)
+
+        for name, frames, x, y, scale_multi in animated_sprites:
+            for frame in range(frames):
+                self.animated_sprite(name, frame, x, y, scale_multi)
+
+    def loaded(self):
+        return [*self.sprites.values(), *self.animated_sprites.values()]
+
+    def clear(self):
+        self.atlas = None
+        self.atlas_rects = None
+        self.files.clear()
+        self.sheets.clear()
+        self.sprites.clear()
+        self.animated_sprites.clear()
+        self.sources.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "sprites": len(self.sprites) + len(self.animated_sprites),
+            "sheets": len(self.sheets)
+        }
+
+
+class RotationCache:
+    def __init__(self, bucket_size=1, max_bytes=32 * 1024 * 1024):
+        self.bucket_size = bucket_size
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.frame_hits = 0
+        self.last_frame_hits = 0
+
+    def bucket(self, angle):
+        return round(angle / self.bucket_size) % round(360 / self.bucket_size)
+
+    def rotated(self, sprite, angle):
+        key = (sprite, self.bucket(angle))
+        rotated_surface = self.surfaces.get(key)
+
+        if rotated_surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            self.frame_hits += 1
+            return rotated_surface
+
+        self.misses += 1
+        return self.store(key, rotozoom(sprite, key[1] * self.bucket_size, 1.0))
+
+    def store(self, key, rotated_surface):
+        w, h = rotated_surface.get_size()
+        size = w * h * rotated_surface.get_bytesize()
+
+        self.surfaces[key] = rotated_surface
+        self.bytes += size
+
+        while self.bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, evicted = self.surfaces.popitem(last=False)
+            w, h = evicted.get_size()
+            self.bytes -= w * h * evicted.get_bytesize()
+            self.evictions += 1
+
+        return rotated_surface
+
+    def bake(self, sprite):
+        for bucket in range(round(360 / self.bucket_size)):
+            key = (sprite, bucket)
+            if key not in self.surfaces:
+                self.store(key, rotozoom(sprite, bucket * self.bucket_size, 1.0))
+
+    def end_frame(self):
+        self.last_frame_hits = self.frame_hits
+        self.frame_hits = 0
+
+    def clear(self):
+        self.surfaces.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "surfaces": len(self.surfaces),
+            "bytes": self.bytes,
+            "avoided_last_frame": self.last_frame_hits
+        }
+
+
+class TextCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size, name=None):
+        font = self.fonts.get((name, size))
+
+        if font is None:
+            font = self.fonts[(name, size)] = Font(name, size)
+
+        return font
+
+    def render(self, font, text, color):
+        key = (font, text, tuple(color))
+        text_surface = self.surfaces.get(key)
+
+        if text_surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return text_surface
+
+        self.misses += 1
+        text_surface = self.surfaces[key] = font.render(text, True, color)
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+
+        return text_surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "surfaces": len(self.surfaces),
+            "fonts": len(self.fonts)
+        }
+
+
+registry = AssetRegistry()
+rotations = RotationCache()
+texts = TextCache()
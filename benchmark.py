@@ -0,0 +1,173 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+from contextlib import redirect_stdout
+from time import perf_counter
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+from pygame.math import Vector2
+from game import Boom
+from models import EnemyBulletNormal, PlayerBulletNormal, HealthShard, FireRateShard
+from clock import game_clock
+from controls import SHOOT, ROTATE_CLOCKWISE
+
+SCENARIOS = {
+    "baseline": {"normal": 6, "slow": 0, "bullets": 50, "items": 4},
+    "crowded": {"normal": 30, "slow": 10, "bullets": 300, "items": 20},
+    "bullet_hell": {"normal": 40, "slow": 20, "bullets": 3000, "items": 40}
+}
+
+PHASES = ("handle_input", "game_logic", "move_objs", "flush", "draw")
+
+
+def random_bullet(boom, owner):
+    position = Vector2(random.randrange(boom.width), random.randrange(boom.height))
+    velocity = Vector2(random.uniform(2, 6), 0).rotate(random.randint(0, 360))
+
+    if owner in boom.player_bullets:
+        return PlayerBulletNormal(position, velocity)
+    return EnemyBulletNormal(position, velocity, "Bullet" if owner == "normal" else "SlowBullet")
+
+
+def top_up_bullets(boom, bullets):
+    owners = (*boom.player_bullets, *boom.enemy_bullets)
+    lanes = {**boom.player_bullets, **boom.enemy_bullets}
+
+    for _ in range(bullets - boom.bullets.count()):
+        owner = random.choice(owners)
+        lanes[owner].append(random_bullet(boom, owner))
+
+
+def build(boom, normal, slow, bullets, items):
+    boom.game_start = True
+    boom.level = 1
+
+    for _ in range(normal):
+        boom.spawn_enemy("normal", Vector2(random.randrange(boom.width), random.randrange(boom.height)))
+    for _ in range(slow):
+        boom.spawn_enemy("slow", Vector2(random.randrange(boom.width), random.randrange(boom.height)))
+    for i in range(items):
+        shard = HealthShard if i % 2 == 0 else FireRateShard
+        boom.entities.add("items", shard(Vector2(random.randrange(boom.width), random.randrange(boom.height))))
+
+    for ship in boom.player_ships.values():
+        ship.take_damage = lambda damage: None
+
+    top_up_bullets(boom, bullets)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(samples):
+    return {
+        "mean_ms": sum(samples) / len(samples) * 1000,
+        "p95_ms": percentile(samples, 0.95) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "max_ms": max(samples) * 1000
+    }
+
+
+def run_scenario(boom, name, ticks, seed, normal, slow, bullets, items):
+    random.seed(seed)
+    boom.reset(seed)
+    build(boom, normal, slow, bullets, items)
+
+    timings = {phase: [] for phase in PHASES}
+    objects = 0
+    actions = {"player1": SHOOT | ROTATE_CLOCKWISE, "player2": SHOOT}
+
+    for tick in range(ticks):
+        top_up_bullets(boom, bullets)
+        objects += len(boom.entities) + boom.bullets.count()
+
+        start = perf_counter()
+        boom.apply_input(actions)
+        input_done = perf_counter()
+        boom.game_logic()
+        logic_done = perf_counter()
+        boom.move_objs()
+        move_done = perf_counter()
+        boom.entities.flush()
+        flush_done = perf_counter()
+        boom.draw()
+        draw_done = perf_counter()
+        game_clock.advance()
+
+        timings["handle_input"].append(input_done - start)
+        timings["game_logic"].append(logic_done - input_done)
+        timings["move_objs"].append(move_done - logic_done)
+        timings["flush"].append(flush_done - move_done)
+        timings["draw"].append(draw_done - flush_done)
+
+    frame_times = [sum(phase_times) for phase_times in zip(*timings.values())]
+    total = sum(frame_times)
+
+    return {
+        "scenario": name,
+        "seed": seed,
+        "ticks": ticks,
+        "entities": {"normal": normal, "slow": slow, "bullets": bullets, "items": items},
+        "phases": {phase: summarize(samples) for phase, samples in timings.items()},
+        "frame": summarize(frame_times),
+        "ticks_per_sec": ticks / total,
+        "objects_per_sec": objects / total,
+        "checksum": boom.checksum()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Boom frame loop on scripted scenarios.")
+    parser.add_argument("scenarios", nargs="*", default=[*SCENARIOS], help="scenario names to run")
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--normal", type=int, help="override the number of EnemyNormal")
+    parser.add_argument("--slow", type=int, help="override the number of EnemySlow")
+    parser.add_argument("--bullets", type=int, help="override the number of bullets in flight")
+    parser.add_argument("--items", type=int, help="override the number of shards")
+    parser.add_argument("--native", action="store_true", help="draw sprites at native size and upscale once per frame")
+    parser.add_argument("--verify", action="store_true", help="run every scenario twice and fail if the runs differ")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    Boom.native_render = args.native
+    boom = Boom(headless=True)
+    boom.scores.persist = False
+    results = []
+
+    with redirect_stdout(sys.stderr):
+        for name in args.scenarios:
+            entities = dict(SCENARIOS[name])
+            for key in entities:
+                if getattr(args, key) is not None:
+                    entities[key] = getattr(args, key)
+            result = run_scenario(boom, name, args.ticks, args.seed, **entities)
+            if args.verify:
+                repeat = run_scenario(boom, name, args.ticks, args.seed, **entities)
+                if repeat["checksum"] != result["checksum"]:
+                    sys.exit(f"{name}: seed {args.seed} gave checksums {result['checksum']} and {repeat['checksum']}")
+            results.append(result)
+
+    report = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "results": results
+    }
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
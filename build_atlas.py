@@ -0,0 +1,91 @@
+import argparse
+import json
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+from pygame.image import load
+from pygame import Surface
+from pygame import SRCALPHA
+from pygame import surfarray
+from assets import SPRITES, ANIMATED_SPRITES, ATLAS, sprite_path, atlas_index_path, atlas_key, scale_sprite, cut_frame
+
+
+def clear_colorkey(image, colorkey=(0, 0, 0)):
+    pixels = surfarray.pixels3d(image)
+    alpha = surfarray.pixels_alpha(image)
+    alpha[(pixels == colorkey).all(axis=2)] = 0
+    del pixels, alpha
+    return image
+
+
+def with_alpha_channel(image):
+    converted = Surface(image.get_size(), SRCALPHA)
+    converted.blit(image, (0, 0))
+    return converted
+
+
+def collect_images(sprites=SPRITES, animated_sprites=ANIMATED_SPRITES):
+    images = {}
+
+    for name, with_alpha, scale_multi in sprites:
+        loaded_sprite = load(sprite_path(name))
+        for scale in {1, scale_multi}:
+            image = scale_sprite(loaded_sprite, scale)
+            images[atlas_key(name, scale)] = image if with_alpha else with_alpha_channel(image)
+
+    for name, frames, x, y, scale_multi in animated_sprites:
+        sheet = load(sprite_path(name))
+        for scale in {1, scale_multi}:
+            for frame in range(frames):
+                images[atlas_key(name, scale, frame)] = clear_colorkey(cut_frame(sheet, frame, x, y, scale))
+
+    return images
+
+
+def pack(images, width, padding):
+    rects = {}
+    x = y = shelf_height = 0
+
+    for key, image in sorted(images.items(), key=lambda item: -item[1].get_height()):
+        w, h = image.get_size()
+        if x + w > width:
+            x, y = 0, y + shelf_height + padding
+            shelf_height = 0
+
+        rects[key] = [x, y, w, h]
+        x += w + padding
+        shelf_height = max(shelf_height, h)
+
+    return rects, y + shelf_height
+
+
+def build(width=256, padding=1):
+    images = collect_images()
+    width = max(width, *(image.get_width() for image in images.values()))
+    rects, height = pack(images, width, padding)
+
+    atlas = Surface((width, height), SRCALPHA)
+    for key, rect in rects.items():
+        atlas.blit(images[key], rect[:2])
+
+    pygame.image.save(atlas, sprite_path(ATLAS))
+    with open(atlas_index_path(), 'w') as file:
+        json.dump(rects, file, indent=2)
+
+    return rects, (width, height)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-scale every sprite and pack them into Assets/atlas.png.")
+    parser.add_argument("--width", type=int, default=256, help="minimum atlas width in pixels")
+    parser.add_argument("--padding", type=int, default=1, help="empty pixels between packed sprites")
+    args = parser.parse_args(argv)
+
+    rects, size = build(args.width, args.padding)
+    print(f"Packed {len(rects)} sprites into {sprite_path(ATLAS)} ({size[0]}x{size[1]})")
+
+
+if __name__ == "__main__":
+    main()
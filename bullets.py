@@ -0,0 +1,184 @@
+import numpy as np
+from pygame.math import Vector2
+from assets import registry, rotations
+
+UP = Vector2(0, -1)
+
+
+class BulletLane:
+    def __init__(self, pool, owner):
+        self.pool = pool
+        self.owner = owner
+
+    def append(self, bullet):
+        self.pool.spawn(self.owner, bullet)
+
+    def extend(self, bullets):
+        self.pool.spawn_many(self.owner, bullets)
+
+    def __len__(self):
+        return self.pool.count(self.owner)
+
+
+class BulletPool:
+    def __init__(self, owners, capacity=1024, scale=1):
+        self.owners = [*owners]
+        self.scale = scale
+        self.owner_ids = {owner: index for index, owner in enumerate(self.owners)}
+        self.kinds = []
+        self.kind_ids = {}
+
+        self.capacity = 0
+        self.positions = np.zeros((0, 2))
+        self.origins = np.zeros((0, 2))
+        self.ages = np.zeros(0, dtype=np.int32)
+        self.velocities = np.zeros((0, 2))
+        self.offsets = np.zeros((0, 2))
+        self.radii = np.zeros(0)
+        self.owner = np.zeros(0, dtype=np.int8)
+        self.kind = np.zeros(0, dtype=np.int16)
+        self.alive = np.zeros(0, dtype=bool)
+        self.surfaces = []
+        self.free = []
+
+        self.grow(capacity)
+
+    def grow(self, capacity):
+        extra = capacity - self.capacity
+
+        self.positions = np.concatenate((self.positions, np.zeros((extra, 2))))
+        self.origins = np.concatenate((self.origins, np.zeros((extra, 2))))
+        self.ages = np.concatenate((self.ages, np.zeros(extra, dtype=np.int32)))
+        self.velocities = np.concatenate((self.velocities, np.zeros((extra, 2))))
+        self.offsets = np.concatenate((self.offsets, np.zeros((extra, 2))))
+        self.radii = np.concatenate((self.radii, np.zeros(extra)))
+        self.owner = np.concatenate((self.owner, np.zeros(extra, dtype=np.int8)))
+        self.kind = np.concatenate((self.kind, np.zeros(extra, dtype=np.int16)))
+        self.alive = np.concatenate((self.alive, np.zeros(extra, dtype=bool)))
+        self.surfaces.extend([None] * extra)
+        self.free.extend(range(capacity - 1, self.capacity - 1, -1))
+
+        self.capacity = capacity
+
+    def lane(self, owner):
+        return BulletLane(self, owner)
+
+    def kind_of(self, sprite):
+        kind = self.kind_ids.get(sprite)
+
+        if kind is None:
+            kind = self.kind_ids[sprite] = len(self.kinds)
+            self.kinds.append(sprite)
+
+        return kind
+
+    def draw_sprite(self, bullet):
+        return bullet.sprite if self.scale == 1 else registry.native(bullet.sprite)
+
+    def spawn(self, owner, bullet):
+        if not self.free:
+            self.grow(self.capacity * 2)
+
+        slot = self.free.pop()
+        rotated_surface = rotations.rotated(self.draw_sprite(bullet), bullet.direction.angle_to(UP))
+
+        self.positions[slot] = bullet.position
+        self.origins[slot] = bullet.position
+        self.ages[slot] = 0
+        self.velocities[slot] = bullet.velocity
+        self.offsets[slot] = rotated_surface.get_width() * 0.5, rotated_surface.get_height() * 0.5
+        self.radii[slot] = bullet.radius
+        self.owner[slot] = self.owner_ids[owner]
+        self.kind[slot] = self.kind_of(bullet.sprite)
+        self.alive[slot] = True
+        self.surfaces[slot] = rotated_surface
+
+        return slot
+
+    def spawn_many(self, owner, bullets):
+        if not bullets:
+            return []
+        while len(self.free) < len(bullets):
+            self.grow(self.capacity * 2)
+
+        slots = [self.free.pop() for bullet in bullets]
+        rotated_surfaces = [rotations.rotated(self.draw_sprite(bullet), bullet.direction.angle_to(UP))
+                            for bullet in bullets]
+
+        self.positions[slots] = self.origins[slots] = [(*bullet.position,) for bullet in bullets]
+        self.ages[slots] = 0
+        self.velocities[slots] = [(*bullet.velocity,) for bullet in bullets]
+        self.offsets[slots] = [(surface.get_width() * 0.5, surface.get_height() * 0.5) for surface in rotated_surfaces]
+        self.radii[slots] = [bullet.radius for bullet in bullets]
+        self.owner[slots] = self.owner_ids[owner]
+        self.kind[slots] = [self.kind_of(bullet.sprite) for bullet in bullets]
+        self.alive[slots] = True
+        for slot, rotated_surface in zip(slots, rotated_surfaces):
+            self.surfaces[slot] = rotated_surface
+
+        return slots
+
+    def release(self, slots):
+        for slot in np.asarray(slots).tolist():
+            if self.alive[slot]:
+                self.alive[slot] = False
+                self.velocities[slot] = 0
+                self.surfaces[slot] = None
+                self.free.append(slot)
+
+    def clear(self):
+        self.release(np.flatnonzero(self.alive))
+
+    def reset(self):
+        self.clear()
+        self.free = [*range(self.capacity - 1, -1, -1)]
+
+    def count(self, owner=None):
+        if owner is None:
+            return int(self.alive.sum())
+        return int((self.alive & (self.owner == self.owner_ids[owner])).sum())
+
+    def owner_of(self, slot):
+        return self.owners[self.owner[slot]]
+
+    def select(self, owners):
+        return np.flatnonzero(self.alive & self.owner_mask(owners)[self.owner])
+
+    def owner_mask(self, owners):
+        mask = np.zeros(len(self.owners), dtype=bool)
+        mask[[self.owner_ids[owner] for owner in owners]] = True
+        return mask
+
+    def collide(self, obj, slots):
+        delta = self.positions[slots] - (obj.position.x, obj.position.y)
+        reach = self.radii[slots] + obj.radius
+        hits = slots[(delta * delta).sum(axis=1) < reach * reach]
+        return hits[self.alive[hits]]
+
+    def collide_each(self, obj, slots):
+        x, y = obj.position
+        positions, radii, alive = self.positions.tolist(), self.radii.tolist(), self.alive.tolist()
+        hits = []
+
+        for slot in slots.tolist():
+            bx, by = positions[slot]
+            reach = radii[slot] + obj.radius
+            if alive[slot] and (bx - x) * (bx - x) + (by - y) * (by - y) < reach * reach:
+                hits.append(slot)
+
+        return np.array(hits, dtype=slots.dtype)
+
+    def move(self):
+        self.positions += self.velocities
+        self.ages += 1
+
+    def cull(self, width, height):
+        x, y = self.positions[:, 0], self.positions[:, 1]
+        outside = self.alive & ((x < 0) | (x >= width) | (y < 0) | (y >= height))
+        self.release(np.flatnonzero(outside))
+
+    def draw(self, surface, alpha=1.0):
+        slots = np.flatnonzero(self.alive)
+        corners = ((self.positions[slots] - self.velocities[slots] * (1 - alpha)) / self.scale -
+                   self.offsets[slots]).tolist()
+        return surface.blits([(self.surfaces[slot], corner) for slot, corner in zip(slots.tolist(), corners)])
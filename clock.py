@@ -0,0 +1,39 @@
+from scheduler import Scheduler
+
+
+class GameClock:
+    def __init__(self, tick_rate=30):
+        self.ticks = 0
+        self.timers = Scheduler()
+        self.set_tick_rate(tick_rate)
+
+    def set_tick_rate(self, tick_rate):
+        self.tick_rate = tick_rate
+        self.tick_ms = 1000 / tick_rate
+
+    def advance(self):
+        self.ticks += 1
+        for callback, args in self.timers.due(self.get_ticks()):
+            callback(*args)
+
+    def get_ticks(self):
+        return round(self.ticks * self.tick_ms)
+
+    def at(self, time, callback, *args):
+        return self.timers.schedule(time, (callback, args))
+
+    def after(self, delay, callback, *args):
+        return self.at(self.get_ticks() + delay, callback, *args)
+
+    def after_ticks(self, ticks, callback, *args):
+        return self.at(round((self.ticks + ticks) * self.tick_ms), callback, *args)
+
+    def cancel(self, timer):
+        self.timers.cancel(timer)
+
+    def reset(self):
+        self.ticks = 0
+        self.timers.clear()
+
+
+game_clock = GameClock()
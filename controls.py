@@ -0,0 +1,50 @@
+import pygame
+
+ROTATE_CLOCKWISE = 1
+ROTATE_COUNTERCLOCKWISE = 2
+ACCELERATE = 4
+DEACCELERATE = 8
+SHOOT = 16
+
+CONTROLS = {
+    "player1": (
+        (pygame.K_d, ROTATE_CLOCKWISE),
+        (pygame.K_a, ROTATE_COUNTERCLOCKWISE),
+        (pygame.K_w, ACCELERATE),
+        (pygame.K_s, DEACCELERATE),
+        (pygame.K_SPACE, SHOOT)
+    ),
+    "player2": (
+        (pygame.K_RIGHT, ROTATE_CLOCKWISE),
+        (pygame.K_LEFT, ROTATE_COUNTERCLOCKWISE),
+        (pygame.K_UP, ACCELERATE),
+        (pygame.K_DOWN, DEACCELERATE),
+        (pygame.K_BACKSPACE, SHOOT)
+    )
+}
+
+
+def read_actions(key_pressed):
+    actions = {}
+
+    for player, controls in CONTROLS.items():
+        mask = 0
+        for key, action in controls:
+            if key_pressed[key]:
+                mask |= action
+        actions[player] = mask
+
+    return actions
+
+
+def apply_actions(ship, mask):
+    if mask & ROTATE_CLOCKWISE:
+        ship.rotate(clockwise=True)
+    if mask & ROTATE_COUNTERCLOCKWISE:
+        ship.rotate(clockwise=False)
+    if mask & ACCELERATE:
+        ship.accelerate()
+    if mask & DEACCELERATE:
+        ship.deaccelerate()
+    if mask & SHOOT:
+        ship.shoot()
@@ -0,0 +1,54 @@
+class EntityRegistry:
+    def __init__(self, kinds):
+        self.kinds = kinds
+        self.buckets = {kind: [] for kind in kinds}
+        self.removed = {}
+
+    def bucket(self, kind):
+        return self.buckets[kind]
+
+    def add(self, kind, entity):
+        bucket = self.buckets[kind]
+        entity.handle = (kind, len(bucket))
+        bucket.append(entity)
+        return entity
+
+    def remove(self, entity):
+        if entity.handle is not None:
+            self.removed[entity] = None
+
+    def is_alive(self, entity):
+        return entity.handle is not None and entity not in self.removed
+
+    def flush(self):
+        for entity in self.removed:
+            kind, index = entity.handle
+            bucket = self.buckets[kind]
+            last = bucket.pop()
+            if last is not entity:
+                bucket[index] = last
+                last.handle = (kind, index)
+            entity.handle = None
+        self.removed.clear()
+
+    def each(self, *kinds):
+        removed = self.removed
+        for kind in kinds or self.kinds:
+            for entity in self.buckets[kind]:
+                if entity not in removed:
+                    yield entity
+
+    def count(self, *kinds):
+        kinds = kinds or self.kinds
+        return sum(len(self.buckets[kind]) for kind in kinds) - \
+            sum(1 for entity in self.removed if entity.handle[0] in kinds)
+
+    def clear(self):
+        for bucket in self.buckets.values():
+            for entity in bucket:
+                entity.handle = None
+            bucket.clear()
+        self.removed.clear()
+
+    def __len__(self):
+        return self.count()
@@ -0,0 +1,215 @@
+import argparse
+import json
+import multiprocessing
+import random
+from multiprocessing.shared_memory import SharedMemory
+from time import perf_counter
+
+import numpy as np
+from game import Boom
+from clock import game_clock
+
+MAX_ENEMIES = 64
+MAX_BULLETS = 256
+MAX_ITEMS = 16
+
+SHIP_FEATURES = ("alive", "x", "y", "vx", "vy", "dx", "dy", "health")
+ENEMY_FEATURES = ("alive", "slow", "x", "y", "vx", "vy", "health")
+BULLET_FEATURES = ("alive", "hostile", "x", "y", "vx", "vy")
+ITEM_FEATURES = ("alive", "fire_rate", "x", "y")
+
+LAYOUT = (
+    ("ships", 2, len(SHIP_FEATURES)),
+    ("enemies", MAX_ENEMIES, len(ENEMY_FEATURES)),
+    ("bullets", MAX_BULLETS, len(BULLET_FEATURES)),
+    ("items", MAX_ITEMS, len(ITEM_FEATURES))
+)
+OBSERVATION_SIZE = sum(rows * columns for name, rows, columns in LAYOUT)
+
+
+def split_observation(observation):
+    sections = {}
+    offset = 0
+
+    for name, rows, columns in LAYOUT:
+        sections[name] = observation[offset:offset + rows * columns].reshape(rows, columns)
+        offset += rows * columns
+
+    return sections
+
+
+class BoomEnv:
+    def __init__(self, seed=None):
+        self.boom = Boom(headless=True)
+        self.boom.scores.persist = False
+        self.seeds = random.Random(seed)
+        self.scores = np.zeros(2, dtype=np.float32)
+        self.episodes = 0
+
+    def reset(self, seed=None, out=None):
+        self.boom.reset(self.seeds.getrandbits(63) if seed is None else seed)
+        self.boom.update({}, start=True)
+        self.scores[:] = 0
+        self.episodes += 1
+
+        return self.observe(out)
+
+    def step(self, actions, out=None):
+        boom = self.boom
+        boom.update({"player1": int(actions[0]), "player2": int(actions[1])})
+
+        scores = np.array([boom.player_scores["player1"], boom.player_scores["player2"]], dtype=np.float32)
+        reward = scores - self.scores
+        self.scores = scores
+        done = not boom.player_ships["player1"] and not boom.player_ships["player2"]
+
+        return self.observe(out), reward, done, {"level": boom.level, "score": boom.score, "tick": game_clock.ticks}
+
+    def observe(self, out=None):
+        observation = np.zeros(OBSERVATION_SIZE, dtype=np.float32) if out is None else out
+        observation[:] = 0
+        sections = split_observation(observation)
+        boom = self.boom
+
+        for row, ship in zip(sections["ships"], boom.player_ships.values()):
+            if ship:
+                row[:] = 1, *ship.position, *ship.velocity, *ship.direction, ship.target_health
+
+        for row, enemy in zip(sections["enemies"], boom.entities.each("normal", "slow")):
+            row[:] = 1, enemy.handle[0] == "slow", *enemy.position, *enemy.velocity, enemy.target_health
+
+        pool = boom.bullets
+        slots = np.flatnonzero(pool.alive)[:MAX_BULLETS]
+        bullets = sections["bullets"][:len(slots)]
+        bullets[:, 0] = 1
+        bullets[:, 1] = pool.owner_mask(("normal", "slow"))[pool.owner[slots]]
+        bullets[:, 2:4] = pool.positions[slots]
+        bullets[:, 4:6] = pool.velocities[slots]
+
+        for row, item in zip(sections["items"], boom.entities.each("items")):
+            row[:] = 1, item.name == "shard_fire_rate", *item.position
+
+        return observation
+
+
+def run_worker(index, connection, names, count, seed):
+    buffers = [SharedMemory(name=name) for name in names]
+    observations, rewards, dones, actions = shared_arrays(buffers, count)
+    env = BoomEnv(seed)
+
+    while True:
+        command = connection.recv()
+
+        if command == "reset":
+            env.reset(out=observations[index])
+            connection.send(None)
+        elif command == "step":
+            observation, rewards[index], dones[index], info = env.step(actions[index], out=observations[index])
+            if dones[index]:
+                env.reset(out=observations[index])
+            connection.send(info)
+        else:
+            break
+
+    del observations, rewards, dones, actions
+    for buffer in buffers:
+        buffer.close()
+    connection.close()
+
+
+def shared_arrays(buffers, count):
+    return (
+        np.ndarray((count, OBSERVATION_SIZE), dtype=np.float32, buffer=buffers[0].buf),
+        np.ndarray((count, 2), dtype=np.float32, buffer=buffers[1].buf),
+        np.ndarray(count, dtype=bool, buffer=buffers[2].buf),
+        np.ndarray((count, 2), dtype=np.uint8, buffer=buffers[3].buf)
+    )
+
+
+class VectorEnv:
+    def __init__(self, count, seed=0, context=None):
+        context = multiprocessing.get_context(context)
+        self.count = count
+
+        self.buffers = [
+            SharedMemory(create=True, size=count * OBSERVATION_SIZE * 4),
+            SharedMemory(create=True, size=count * 2 * 4),
+            SharedMemory(create=True, size=count),
+            SharedMemory(create=True, size=count * 2)
+        ]
+        self.observations, self.rewards, self.dones, self.actions = shared_arrays(self.buffers, count)
+
+        self.connections = []
+        self.processes = []
+        for index in range(count):
+            connection, worker_connection = context.Pipe()
+            process = context.Process(target=run_worker, daemon=True,
+                                      args=(index, worker_connection, [buffer.name for buffer in self.buffers],
+                                            count, seed + index))
+            process.start()
+            self.connections.append(connection)
+            self.processes.append(process)
+
+        self.steps = 0
+        self.episodes = 0
+        self.started = None
+
+    def send(self, command):
+        for connection in self.connections:
+            connection.send(command)
+        return [connection.recv() for connection in self.connections]
+
+    def reset(self):
+        self.send("reset")
+        self.started = perf_counter()
+        return self.observations
+
+    def step(self, actions):
+        self.actions[:] = actions
+        infos = self.send("step")
+        self.steps += self.count
+        self.episodes += int(self.dones.sum())
+
+        return self.observations, self.rewards, self.dones, infos
+
+    def steps_per_sec(self):
+        return self.steps / (perf_counter() - self.started)
+
+    def close(self):
+        for connection in self.connections:
+            connection.send("close")
+        for process in self.processes:
+            process.join()
+
+        del self.observations, self.rewards, self.dones, self.actions
+        for buffer in self.buffers:
+            buffer.close()
+            buffer.unlink()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Boom games in parallel with random pilots.")
+    parser.add_argument("--envs", type=int, default=multiprocessing.cpu_count(), help="number of game processes")
+    parser.add_argument("--steps", type=int, default=1000, help="steps per game")
+    parser.add_argument("--seed", type=int, default=0, help="base seed; game i uses seed + i")
+    args = parser.parse_args(argv)
+
+    envs = VectorEnv(args.envs, args.seed)
+    pilots = np.random.default_rng(args.seed)
+    try:
+        envs.reset()
+        for _ in range(args.steps):
+            envs.step(pilots.integers(0, 32, size=(args.envs, 2)))
+
+        print(json.dumps({
+            "envs": args.envs,
+            "steps": envs.steps,
+            "episodes": envs.episodes,
+            "steps_per_sec": envs.steps_per_sec()
+        }, indent=2))
+    finally:
+        envs.close()
+
+
+if __name__ == "__main__":
+    main()
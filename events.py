@@ -0,0 +1,121 @@
+import queue
+import threading
+
+import numpy as np
+
+MAGIC = b"BOOMEVT1"
+
+KINDS = ("hit", "kill", "drop", "pickup", "death", "level_up")
+NAMES = ("", "player1", "player2", "normal", "slow", "shard_health", "shard_fire_rate")
+KIND_IDS = {kind: index for index, kind in enumerate(KINDS)}
+NAME_IDS = {name: index for index, name in enumerate(NAMES)}
+
+EVENT = np.dtype([
+    ("tick", "<u4"),
+    ("kind", "u1"),
+    ("actor", "u1"),
+    ("subject", "u1"),
+    ("x", "<f4"),
+    ("y", "<f4"),
+    ("value", "<f4")
+])
+
+
+class EventWriter:
+    def __init__(self, path):
+        self.path = path
+        self.batches = queue.Queue()
+        self.written = 0
+
+        with open(path, 'wb') as file:
+            file.write(MAGIC)
+
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        with open(self.path, 'ab') as file:
+            while True:
+                batches = [self.batches.get()]
+                while not self.batches.empty():
+                    batches.append(self.batches.get())
+
+                stop = batches[-1] is None
+                data = b"".join(batch for batch in batches if batch is not None)
+                if data:
+                    file.write(data)
+                    file.flush()
+                    self.written += len(data) // EVENT.itemsize
+                if stop:
+                    return
+
+    def write(self, records):
+        self.batches.put(records.tobytes())
+
+    def close(self):
+        if self.thread.is_alive():
+            self.batches.put(None)
+            self.thread.join()
+
+
+class EventBus:
+    def __init__(self, capacity=4096, clock=None):
+        self.capacity = capacity
+        self.clock = clock
+        self.records = np.zeros(capacity, dtype=EVENT)
+        self.head = 0
+        self.dispatched = 0
+        self.dropped = 0
+        self.subscribers = [[] for _ in KINDS]
+        self.writer = None
+
+    def subscribe(self, kind, callback):
+        self.subscribers[KIND_IDS[kind]].append(callback)
+
+    def open_log(self, path):
+        self.close_log()
+        self.writer = EventWriter(path)
+
+    def close_log(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.writer = None
+
+    def publish(self, kind, actor="", subject="", position=(0, 0), value=0):
+        x, y = position
+        self.records[self.head % self.capacity] = (self.clock.ticks if self.clock else 0, KIND_IDS[kind],
+                                                   NAME_IDS[actor], NAME_IDS[subject], x, y, value)
+        self.head += 1
+
+    def pending(self):
+        start = max(self.dispatched, self.head - self.capacity)
+        self.dropped += start - self.dispatched
+
+        first, last = start % self.capacity, self.head % self.capacity
+        if self.head - start == 0:
+            return self.records[:0]
+        if first < last:
+            return self.records[first:last]
+        return np.concatenate((self.records[first:], self.records[:last]))
+
+    def dispatch(self):
+        if self.head == self.dispatched:
+            return
+
+        records = self.pending()
+        self.dispatched = self.head
+
+        if self.writer is not None:
+            self.writer.write(records)
+
+        subscribers = self.subscribers
+        for tick, kind, actor, subject, x, y, value in records.tolist():
+            for callback in subscribers[kind]:
+                callback(NAMES[actor], NAMES[subject], (x, y), value)
+
+
+def read_events(path):
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a Boom event log")
+        return np.frombuffer(file.read(), dtype=EVENT)
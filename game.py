@@ -1,320 +1,552 @@
+import os
+import struct
+import zlib
+import threading
 import pygame
-from models import EnemyNormal, EnemySlow, SpaceShip, HealthShard, FireRateShard
-from utils import get_random_pos, print_text, write_high_score, read_high_score, roll_chance
-from sounds import play_sound
-from math import floor
+import startup
+from pygame.math import Vector2
+from models import EnemyNormal, EnemySlow, SpaceShip, HealthShard, FireRateShard, SPRITE_SCALE
+from utils import print_text, roll_chance, seed_rng
+from sounds import play_sound, mute, flush_sounds, load_sounds
+from events import EventBus
+from assets import registry, rotations, texts
+from spatial import SpatialHash, BruteForce
+from scheduler import Scheduler
+from waves import ENEMY_TYPES, SpawnSampler, WaveBuilder
+from bullets import BulletPool
+from entities import EntityRegistry
+from clock import game_clock
+from controls import read_actions, apply_actions
+from replay import InputRecorder, InputLog, Replay, new_seed
+from net import NetHost, NetClient
+from split import SplitView
+from profiler import Profiler
+from scores import ScoreStore
+from hud import Hud
+from render import Display
 
 
 class Boom:
-    def __init__(self):
+    bake_rotations = False
+    broad_phase = True
+    cell_size = 64
+    tick_rate = 30
+    max_fps = 120
+    max_ticks_per_frame = 5
+    profile_entities = False
+    profile_path = "profile.json"
+    dirty_rects = False
+    dirty_threshold = 0.5
+    report_startup = False
+    record_path = None
+    replay_path = None
+    seed = None
+    net_role = None
+    net_address = ("127.0.0.1", 47800)
+    net_latency = 0
+    net_jitter = 0
+    net_loss = 0
+    event_log_path = None
+    window_size = None
+    render_backend = "surface"
+    native_render = False
+    split_mode = False
+
+    def __init__(self, headless=False):
+        self.headless = headless
         self.level = 0
         self.score = 0
         self.player_scores = {
             "player1": 0,
             "player2": 0
         }
-        self.high_score = read_high_score('score').replace('\n1', "")
-        self.highest_level = read_high_score('level')
+        self.scores = ScoreStore()
+        self.high_score = self.scores.high_score
+        self.highest_level = self.scores.highest_level
         self.game_start = False
 
         self.resolution = self.width, self.height = 800, 600
-        self.init_pygame()
-        self.screen = pygame.display.set_mode(self.resolution)
+        with startup.phase("display"):
+            self.init_pygame()
+            self.display = Display(self.resolution, None if headless else self.window_size,
+                                   "surface" if headless else self.render_backend,
+                                   SPRITE_SCALE if self.native_render else 1)
+            self.screen = self.display.canvas
         self.time = pygame.time
+        self.clock = pygame.time.Clock()
+        game_clock.set_tick_rate(self.tick_rate)
 
-        self.font = pygame.font.Font(None, 32)
+        self.loaded = False
+        self.loader = threading.Thread(target=self.load_assets, daemon=True)
+        self.loader.start()
+
+        self.font = texts.font(32)
+        self.title_font = texts.font(64)
+        self.hud = Hud(self.resolution, self.font)
+        self.previous_rects = None
         self.message = ""
+        self.recorder = None
+        self.replay = None
+        self.net = None
+        self.split = None
+
+        self.profiler = Profiler(entities=self.profile_entities,
+                                 entity_classes=(SpaceShip, EnemyNormal, EnemySlow, HealthShard, FireRateShard))
 
+        self.bullets = BulletPool(("player1", "player2", "normal", "slow"), scale=self.display.world_scale)
         self.player_bullets = {
-            "player1": [],
-            "player2": []
+            "player1": self.bullets.lane("player1"),
+            "player2": self.bullets.lane("player2")
         }
         self.enemy_bullets = {
-            "normal": [],
-            "slow": []
+            "normal": self.bullets.lane("normal"),
+            "slow": self.bullets.lane("slow")
         }
+        self.entities = EntityRegistry(("items", "ships", "normal", "slow"))
+        self.fire_schedule = Scheduler()
+        self.waves = WaveBuilder()
+        self.spawns = SpawnSampler(self.width, self.height)
         self.enemies = {
-            "normal": [],
-            "slow": []
+            "normal": self.entities.bucket("normal"),
+            "slow": self.entities.bucket("slow")
         }
         self.player_ships = {
-            "player1": SpaceShip((200, 300), self.player_bullets["player1"].append, 200),
-            "player2": SpaceShip((600, 300), self.player_bullets["player2"].append, 200)
+            "player1": None,
+            "player2": None
         }
-        self.items = []
+        self.items = self.entities.bucket("items")
+
+        self.events = EventBus(clock=game_clock)
+        self.events.subscribe("hit", self.on_hit)
+        self.events.subscribe("hit", lambda *event: play_sound("normal_enemy", "hurt"))
+        self.events.subscribe("kill", lambda *event: play_sound("normal_enemy", "explosion"))
+        self.events.subscribe("pickup", lambda *event: play_sound("misc", "item_pickup"))
+        self.events.subscribe("death", lambda *event: play_sound("player", "explosion"))
+        self.events.subscribe("level_up", self.on_level_up)
+        if self.event_log_path:
+            self.events.open_log(self.event_log_path)
+
+        if self.headless:
+            self.finish_loading()
+
+    def load_assets(self):
+        with startup.phase("audio"):
+            load_sounds()
+        with startup.phase("decode"):
+            registry.decode()
+
+    def finish_loading(self):
+        self.loader.join()
+
+        with startup.phase("assets"):
+            registry.preload()
+            if self.display.world is not None:
+                for sprite in registry.loaded():
+                    registry.native(sprite)
+            if self.bake_rotations:
+                for sprite in registry.loaded():
+                    rotations.bake(sprite)
+
+        self.new_game()
+        self.loaded = True
+        startup.mark("ready")
+
+        if self.replay_path:
+            self.replay = Replay(InputLog(self.replay_path))
+            self.replay.begin(self)
+        elif self.record_path:
+            self.reset(new_seed() if self.seed is None else self.seed)
+            self.recorder = InputRecorder(self.record_path, self.seed, self.tick_rate)
+
+        if self.net_role == "host":
+            self.net = NetHost(self.net_address, self.net_latency, self.net_jitter, self.net_loss)
+        elif self.net_role == "join":
+            self.net = NetClient(self.net_address, self.net_latency, self.net_jitter, self.net_loss)
+            self.net.begin(self)
+
+        if self.split_mode and not self.headless:
+            self.split = SplitView(self)
+            self.split.begin(self)
+
+    def reset(self, seed):
+        self.seed = seed
+        seed_rng(seed)
+        game_clock.reset()
+        self.bullets.reset()
+        self.game_start = False
+        self.new_game()
 
     def main_loop(self):
+        accumulator = 0
         while True:
-            if self.game_start:
-                self.game_logic()
-            self.move_objs()
-            self.handle_input()
-            self.draw()
+            if not self.loaded and not self.loader.is_alive():
+                self.finish_loading()
+            accumulator += min(self.clock.tick(self.max_fps), game_clock.tick_ms * self.max_ticks_per_frame)
+
+            ticks = 0
+            while accumulator >= game_clock.tick_ms and ticks < self.max_ticks_per_frame:
+                self.tick()
+                accumulator -= game_clock.tick_ms
+                ticks += 1
+            if ticks == self.max_ticks_per_frame:
+                accumulator = 0
+
+            self.draw(accumulator / game_clock.tick_ms)
+            if self.profiler.enabled:
+                self.profiler.end_frame(self.bullets.count(), self.entities.count("normal", "slow"),
+                                        self.entities.count("items"))
+
+    def tick(self):
+        actions, start = self.handle_input()
+
+        if self.replay:
+            if not self.replay.step(self):
+                print("Replay finished:", self.replay.report(self))
+                self.replay = None
+            return
+        if self.net:
+            self.net.tick(self, actions, start)
+            return
+        if self.split:
+            self.split.tick(self, actions, start)
+            return
+
+        self.update(actions, start)
+        if self.recorder:
+            self.recorder.write(actions, start, self.checksum())
+
+    def update(self, actions, start=False):
+        if self.game_start:
+            self.game_logic()
+        self.move_objs()
+        self.apply_input(actions, start)
+        self.entities.flush()
+        flush_sounds()
+        game_clock.advance()
+
+    def step(self, actions=None, start=False):
+        self.update(actions or {}, start)
+        return self.state()
+
+    def run(self, ticks, actions=None, start=True):
+        for tick in range(ticks):
+            tick_actions = actions(tick) if callable(actions) else actions
+            self.update(tick_actions or {}, start and tick == 0)
+        return self.state()
+
+    def state(self):
+        ships = {}
+        for player, ship in self.player_ships.items():
+            ships[player] = {
+                "position": (ship.position.x, ship.position.y),
+                "velocity": (ship.velocity.x, ship.velocity.y),
+                "health": ship.target_health
+            } if ship else None
+
+        return {
+            "tick": game_clock.ticks,
+            "game_start": self.game_start,
+            "message": self.message,
+            "level": self.level,
+            "score": self.score,
+            "player_scores": dict(self.player_scores),
+            "ships": ships,
+            "enemies": {enemy_type: len(enemies) for enemy_type, enemies in self.enemies.items()},
+            "bullets": {owner: self.bullets.count(owner) for owner in self.bullets.owners},
+            "items": len(self.items)
+        }
+
+    def checksum(self):
+        values = [game_clock.ticks, self.level, self.score, *self.player_scores.values()]
+        for entity in self.entities.each():
+            values.extend((*entity.position, *entity.velocity, getattr(entity, "target_health", 0)))
+
+        checksum = zlib.crc32(struct.pack(f"<{len(values)}d", *values))
+        return zlib.crc32(self.bullets.positions[self.bullets.alive].tobytes(), checksum)
 
     def init_pygame(self):
-        pygame.init()
+        if self.headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+            pygame.display.quit()
+            mute()
+        pygame.display.init()
+        pygame.font.init()
         pygame.display.set_caption("Boom")
 
     def handle_input(self):
+        start = False
         for event in pygame.event.get():
-            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+            if event.type in (pygame.QUIT, pygame.WINDOWCLOSE) or \
+                    (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                if self.profiler.histogram:
+                    self.profiler.dump(self.profile_path)
+                self.scores.flush(background=False)
+                if self.recorder:
+                    self.recorder.close()
+                self.events.close_log()
+                if self.net:
+                    self.net.close()
+                if self.split:
+                    print("Split mode:", self.split.stats(self.clock.get_fps()))
+                    self.split.close()
                 quit()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler.toggle(self)
             if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
-                self.game_start = True
+                start = True
 
+        return read_actions(pygame.key.get_pressed()), start
+
+    def apply_input(self, actions, start=False):
+        if start and self.loaded:
+            self.game_start = True
             if self.message:
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
-                    self.level = 0
-                    self.score = 0
-                    self.player_scores = {
-                        "player1": 0,
-                        "player2": 0
-                    }
-                    self.message = ""
-
-                    self.player_bullets = {
-                        "player1": [],
-                        "player2": []
-                    }
-                    self.enemy_bullets = {
-                        "normal": [],
-                        "slow": []
-                    }
-                    self.enemies = {
-                        "normal": [],
-                        "slow": []
-                    }
-                    self.player_ships = {
-                        "player1": SpaceShip((200, 300), self.player_bullets["player1"].append, 200),
-                        "player2": SpaceShip((600, 300), self.player_bullets["player2"].append, 200)
-                    }
-                    self.items = []
-
-        key_pressed = pygame.key.get_pressed()
+                self.new_game()
 
         for player, ship in (*self.player_ships.items(),):
-            if player == "player1" and ship:
-                if key_pressed[pygame.K_d]:
-                    ship.rotate(clockwise=True)
-                if key_pressed[pygame.K_a]:
-                    ship.rotate(clockwise=False)
-                if key_pressed[pygame.K_w]:
-                    ship.accelerate()
-                if key_pressed[pygame.K_s]:
-                    ship.deaccelerate()
-                if key_pressed[pygame.K_SPACE]:
-                    ship.shoot()
-            if player == "player2" and ship:
-                if key_pressed[pygame.K_RIGHT]:
-                    ship.rotate(clockwise=True)
-                if key_pressed[pygame.K_LEFT]:
-                    ship.rotate(clockwise=False)
-                if key_pressed[pygame.K_UP]:
-                    ship.accelerate()
-                if key_pressed[pygame.K_DOWN]:
-                    ship.deaccelerate()
-                if key_pressed[pygame.K_BACKSPACE]:
-                    ship.shoot()
+            if ship:
+                apply_actions(ship, actions.get(player, 0))
+
+    def new_game(self):
+        self.level = 0
+        self.score = 0
+        self.player_scores = {
+            "player1": 0,
+            "player2": 0
+        }
+        self.message = ""
+
+        self.bullets.clear()
+        self.entities.clear()
+        self.fire_schedule.clear()
+        self.waves.prepare(self.level)
+        self.player_ships = {
+            "player1": self.entities.add("ships", SpaceShip((200, 300), self.player_bullets["player1"].append, 200)),
+            "player2": self.entities.add("ships", SpaceShip((600, 300), self.player_bullets["player2"].append, 200))
+        }
+
+    def spawn_enemy(self, enemy_type, position):
+        return self.add_enemy(enemy_type, ENEMY_TYPES[enemy_type](position))
+
+    def add_enemy(self, enemy_type, enemy):
+        self.entities.add(enemy_type, enemy)
+        self.fire_schedule.schedule(enemy.last_shot + enemy.cooldown, enemy)
+        return enemy
+
+    def on_hit(self, player, enemy_type, position, points):
+        self.score += int(points)
+        self.player_scores[player] += int(points)
+
+        self.scores.submit_score(self.score)
+        self.high_score = self.scores.high_score
+
+    def on_level_up(self, actor, subject, position, level):
+        self.scores.submit_level(int(level))
+        self.highest_level = self.scores.highest_level
+        self.scores.flush()
+
+        if level > 1:
+            play_sound("misc", "new_level")
+
+    def new_grid(self):
+        grid_type = SpatialHash if self.broad_phase else BruteForce
+        return grid_type(self.width, self.height, self.cell_size)
 
     def move_objs(self):
-        for obj in self.get_objects():
+        for obj in self.entities.each():
+            obj.previous_position = Vector2(obj.position)
             obj.move(self.screen)
+        self.bullets.move()
+        self.magnet_items()
+
+    def magnet_items(self):
+        item_grid = self.new_grid()
+        for item in self.entities.each("items"):
+            item_grid.insert(item)
+
+        for ship in (*self.player_ships.values(),):
+            if ship:
+                for item in item_grid.query_radius(ship.position, 75):
+                    if item.position.distance_to(ship.position) < 75:
+                        item.magnet(ship.position.x, ship.position.y, item.position.x, item.position.y)
 
     def game_logic(self):
-        for player in self.player_bullets:
-            for bullet in self.player_bullets[player][:]:
-                if not self.screen.get_rect().collidepoint(bullet.position):
-                    if bullet:
-                        self.player_bullets[player].remove(bullet)
-
-        for enemy in self.enemy_bullets:
-            for bullet in self.enemy_bullets[enemy][:]:
-                if not self.screen.get_rect().collidepoint(bullet.position):
-                    if bullet:
-                        self.enemy_bullets[enemy].remove(bullet)
-
-        for item in self.items[:]:
-            for ship in (*self.player_ships.values(),):
-                if ship:
-                    if item.collides_with(ship):
-                        play_sound("misc", "item_pickup")
+        self.bullets.cull(*self.screen.get_size())
+
+        item_grid = self.new_grid()
+        for item in self.entities.each("items"):
+            item_grid.insert(item)
+
+        picked_items = set()
+        for player, ship in (*self.player_ships.items(),):
+            if ship:
+                for item in item_grid.query(ship):
+                    if item not in picked_items and item.collides_with(ship):
+                        picked_items.add(item)
+                        self.events.publish("pickup", player, item.name, item.position)
                         if item.name == "shard_health":
                             ship.heal(item.healing_factor)
-                            self.items.remove(item)
+                            self.entities.remove(item)
                         if item.name == "shard_fire_rate":
                             if ship.cooldown > 100:
                                 ship.cooldown -= item.fire_rate_factor
-                            self.items.remove(item)
-
-        def check_bullet_hit(player):
-            to_remove = []
-            for bullet in self.player_bullets[player][:]:
-                for enemy_type in self.enemies:
-                    for enemy in self.enemies[enemy_type][:]:
-                        if enemy.collides_with(bullet):
-                            self.score += enemy.max_health * 2 * self.level
-                            self.player_scores[player] += enemy.max_health * 2 * self.level
-
-                            write_high_score(self.score, 'score')
-                            self.high_score = read_high_score('score')
-
-                            to_remove.append(bullet)
-
-                            enemy.take_damage(25)
-                            play_sound("normal_enemy", "hurt")
-            for bullet in to_remove[:]:
-                if bullet in self.player_bullets[player]:
-                    self.player_bullets[player].remove(bullet)
-
-        check_bullet_hit('player1')
-        check_bullet_hit('player2')
-
-        for enemy_type in self.enemies:
-            for enemy in self.enemies[enemy_type][:]:
-                if enemy.target_health <= 0:
-                    if roll_chance(enemy.health_drop_chance):
-                        self.items.append(HealthShard(enemy.position))
-                    if roll_chance(enemy.fire_rate_drop_chance):
-                        self.items.append(FireRateShard(enemy.position))
-
-                    self.enemies[enemy_type].remove(enemy)
-                    play_sound("normal_enemy", "explosion")
-
-        for enemy_type in self.enemy_bullets:
-            for bullet in self.enemy_bullets[enemy_type][:]:
-                for player in self.player_ships:
-                    if self.player_ships[player]:
-                        if self.player_ships[player].collides_with(bullet):
-                            self.player_ships[player].take_damage(25)
-                            if bullet:
-                                self.enemy_bullets[enemy_type].remove(bullet)
-
-                            if self.player_ships[player].target_health <= 0:
-                                self.player_ships[player] = None
-                                play_sound("player", "explosion")
-
-        def check_enemy_spawn():
-            while True:
-                position = get_random_pos(self.screen)
-
-                if self.player_ships["player1"] and not self.player_ships["player2"]:
-                    if position.distance_to(self.player_ships["player1"].position) > 100:
-                        return position
-                if self.player_ships["player2"] and not self.player_ships["player1"]:
-                    if position.distance_to(self.player_ships["player2"].position) > 100:
-                        return position
-                if self.player_ships["player1"] and self.player_ships["player2"]:
-                    if position.distance_to(self.player_ships["player1"].position) > 100 \
-                            and position.distance_to(self.player_ships["player2"].position) > 100:
-                        return position
-
-        def check_alive_enemies():
-            for enemy_type in (*self.enemies.values(),):
-                for enemies in enemy_type:
-                    if enemies:
-                        return True
-            return False
-
-        if not check_alive_enemies():
-            for _ in range(floor(6 + round(self.level / 2))):
-                position = check_enemy_spawn()
-                self.enemies["normal"].append(EnemyNormal(position, self.enemy_bullets["normal"].append))
-
-            if self.level >= 5:
-                for _ in range(floor(self.level - 5)):
-                    position = check_enemy_spawn()
-                    self.enemies["slow"].append(EnemySlow(position, self.enemy_bullets["slow"].append))
+                            self.entities.remove(item)
+
+        collide = self.bullets.collide if self.broad_phase else self.bullets.collide_each
+        player_slots = self.bullets.select(self.player_bullets)
+        hit_slots = []
+        for enemy in self.entities.each("normal", "slow"):
+            for slot in collide(enemy, player_slots).tolist():
+                hit_slots.append(slot)
+                enemy.take_damage(25)
+                self.events.publish("hit", self.bullets.owner_of(slot), enemy.handle[0], enemy.position,
+                                    enemy.max_health * 2 * self.level)
+        self.bullets.release(hit_slots)
+
+        for enemy in self.entities.each("normal", "slow"):
+            if enemy.target_health <= 0:
+                if roll_chance(enemy.health_drop_chance):
+                    item = self.entities.add("items", HealthShard(enemy.position))
+                    self.events.publish("drop", enemy.handle[0], item.name, item.position)
+                if roll_chance(enemy.fire_rate_drop_chance):
+                    item = self.entities.add("items", FireRateShard(enemy.position))
+                    self.events.publish("drop", enemy.handle[0], item.name, item.position)
+
+                self.events.publish("kill", "", enemy.handle[0], enemy.position, enemy.max_health)
+                self.entities.remove(enemy)
+
+        enemy_slots = self.bullets.select(self.enemy_bullets)
+        for player in self.player_ships:
+            if not self.player_ships[player]:
+                continue
+            for slot in collide(self.player_ships[player], enemy_slots).tolist():
+                self.player_ships[player].take_damage(25)
+                self.bullets.release((slot,))
+
+                if self.player_ships[player].target_health <= 0:
+                    self.events.publish("death", player, "", self.player_ships[player].position)
+                    self.entities.remove(self.player_ships[player])
+                    self.player_ships[player] = None
+                    break
+
+        if not self.entities.count("normal", "slow"):
+            wave = self.waves.take(self.level)
+            positions = self.spawns.sample(len(wave), [ship.position for ship in self.player_ships.values() if ship])
+            for (enemy_type, enemy), position in zip(wave, positions):
+                enemy.position, enemy.previous_position = position, Vector2(position)
+                enemy.last_shot = game_clock.get_ticks()
+                self.add_enemy(enemy_type, enemy)
 
             self.level += 1
-            write_high_score(self.level, 'level')
-            self.highest_level = read_high_score('level')
+            self.waves.prepare(self.level)
+            self.events.publish("level_up", value=self.level)
 
             if not self.player_ships["player1"]:
-                self.player_ships["player1"] = SpaceShip((200, 300), self.player_bullets["player1"].append, 100)
+                self.player_ships["player1"] = self.entities.add(
+                    "ships", SpaceShip((200, 300), self.player_bullets["player1"].append, 100))
             if not self.player_ships["player2"]:
-                self.player_ships["player2"] = SpaceShip((600, 300), self.player_bullets["player2"].append, 100)
-
-            if self.level > 1:
-                play_sound("misc", "new_level")
-
-        for enemy_type in self.enemies:
-            if self.enemies[enemy_type] is not None:
-                for enemy in self.enemies[enemy_type][:]:
-                    enemy.shoot()
-
-        if not self.player_ships["player1"] and not self.player_ships["player2"]:
+                self.player_ships["player2"] = self.entities.add(
+                    "ships", SpaceShip((600, 300), self.player_bullets["player2"].append, 100))
+
+        now = game_clock.get_ticks()
+        volleys = {enemy_type: [] for enemy_type in ENEMY_TYPES}
+        for enemy in self.fire_schedule.due(now):
+            if self.entities.is_alive(enemy):
+                volleys[enemy.handle[0]].append(enemy.fire(now))
+                self.fire_schedule.schedule(now + enemy.cooldown, enemy)
+        for enemy_type, bullets in volleys.items():
+            if bullets:
+                self.enemy_bullets[enemy_type].extend(bullets)
+                play_sound("normal_enemy", "shoot", 0.1)
+
+        self.waves.step()
+        self.events.dispatch()
+
+        if not self.player_ships["player1"] and not self.player_ships["player2"] and not self.message:
             self.message = "You lost!"
-
-    def draw(self):
-        self.screen.fill((0, 0, 0))
-
-        for object in self.get_objects():
-            object.draw(self.screen)
+            if self.scores.persist:
+                self.scores.record_run(self.score, self.level, self.player_scores)
+                self.scores.flush()
+
+    def draw(self, alpha=1.0):
+        if self.display.world is not None:
+            rects = self.draw_world(alpha)
+        else:
+            if self.dirty_rects and self.previous_rects is not None:
+                for rect in self.previous_rects:
+                    self.screen.fill((0, 0, 0), rect)
+            else:
+                self.screen.fill((0, 0, 0))
+
+            rects = []
+            for object in self.entities.each():
+                rects.append(object.draw(self.screen, alpha))
+            rects.extend(self.bullets.draw(self.screen, alpha))
 
         if self.message:
-            print_text(self.screen, self.message, pygame.font.Font(None, 64), self.screen.get_size(), 'title')
-            print_text(self.screen, "Press [Enter] to start a new game.", pygame.font.Font(None, 32),
-                       (self.screen.get_width(), self.screen.get_height() / 2 + 30), 'score')
-
-        def text():
-            print_text(self.screen, "Level : {:,}".format(self.level), self.font, (self.screen.get_width(), 15),
-                       'score')
-            print_text(self.screen, "Score : {:,}".format(self.score), self.font, (self.screen.get_width(), 15 + 25),
-                       'score')
-            print_text(self.screen, "High Score : {:,}".format(int(self.high_score)), self.font,
-                       (self.screen.get_width(),
-                        15 + 25 * 2), 'score')
-            print_text(self.screen, "Highest Level : {:,}".format(int(self.highest_level)), self.font,
-                       (self.screen.get_width(), 15 + 25 * 3), 'score')
-
-            print_text(self.screen, "Ship 1", self.font, (0, 15), "player1")
-            print_text(self.screen, "Ship 2", self.font, (self.screen.get_width(), 15), "player2")
-            print_text(self.screen, "{:,}".format(int(self.player_scores["player1"])), self.font,
-                       (0, 15 + 25), "player1")
-            print_text(self.screen, "{:,}".format(int(self.player_scores["player2"])), self.font,
-                       (self.screen.get_width(), 15 + 25), "player2")
-
-        text()
+            rects.append(print_text(self.screen, self.message, self.title_font, self.screen.get_size(), 'title'))
+            rects.append(print_text(self.screen, "Press [Enter] to start a new game.", self.font,
+                                    (self.screen.get_width(), self.screen.get_height() / 2 + 30), 'score'))
+
+        rects.append(self.hud.draw(self.screen, (self.level, self.score, int(self.high_score),
+                                                 int(self.highest_level), int(self.player_scores["player1"]),
+                                                 int(self.player_scores["player2"]))))
 
         if self.player_ships["player1"]:
-            self.player_ships["player1"].health(self.screen, 15, 7 + 25 * 2, 1)
-            for item in self.items[:]:
-                if item.position.distance_to(self.player_ships["player1"].position) < 75:
-                    item.magnet(self.player_ships["player1"].position.x, self.player_ships["player1"].position.y,
-                                item.position.x, item.position.y)
+            rects.append(self.player_ships["player1"].health(self.screen, 15, 7 + 25 * 2, 1))
         if self.player_ships["player2"]:
-            self.player_ships["player2"].health(self.screen, self.screen.get_width(), 7 + 25 * 2, 2)
-            for item in self.items[:]:
-                if item.position.distance_to(self.player_ships["player2"].position) < 75:
-                    item.magnet(self.player_ships["player2"].position.x, self.player_ships["player2"].position.y,
-                                item.position.x, item.position.y)
+            rects.append(self.player_ships["player2"].health(self.screen, self.screen.get_width(), 7 + 25 * 2, 2))
 
         if not self.game_start:
-            print_text(self.screen, "Boom", pygame.font.Font(None, 64), self.screen.get_size(), 'title')
-            print_text(self.screen, "Press [Enter] to start a new game.", pygame.font.Font(None, 32),
-                       (self.screen.get_width(), self.screen.get_height() / 2 + 30), 'score')
-
-        pygame.display.flip()
-        self.time.wait(30)
-
-    def get_objects(self):
-        objects = [*self.items]
+            rects.append(print_text(self.screen, "Boom", self.title_font, self.screen.get_size(), 'title'))
+            rects.append(print_text(self.screen, "Press [Enter] to start a new game." if self.loaded else "Loading...",
+                                    self.font, (self.screen.get_width(), self.screen.get_height() / 2 + 30), 'score'))
+
+        if self.profiler.enabled:
+            rects.append(self.profiler.draw(self.screen))
+            if self.net:
+                rects.append(self.net.draw(self.screen))
+            if self.split:
+                rects.append(self.split.draw(self.screen, self.clock.get_fps()))
+
+        rotations.end_frame()
+        self.present(rects)
+
+    def draw_world(self, alpha):
+        world, scale = self.display.world, self.display.world_scale
+        world.fill((0, 0, 0))
+        for object in self.entities.each("ships", "normal", "slow"):
+            object.draw(world, alpha, scale)
+        self.bullets.draw(world, alpha)
+        self.display.compose()
+
+        rects = [self.screen.get_rect()]
+        for item in self.entities.each("items"):
+            rects.append(item.draw(self.screen, alpha))
+        for enemy in self.entities.each("normal", "slow"):
+            rects.append(enemy.health(self.screen, enemy.render_position(alpha)))
+        return rects
+
+    def present(self, rects):
+        startup.mark("first_frame")
+        if self.report_startup and self.loaded:
+            self.report_startup = False
+            print("Startup (ms):", ", ".join(f"{name} {elapsed}" for name, elapsed in startup.report().items()))
+
+        if not self.dirty_rects:
+            self.display.present()
+            return
+
+        screen_rect = self.screen.get_rect()
+        rects = [rect.clip(screen_rect) for rect in rects]
+        dirty = rects if self.previous_rects is None else self.previous_rects + rects
+
+        if self.previous_rects is None or \
+                sum(rect.w * rect.h for rect in dirty) > self.dirty_threshold * screen_rect.w * screen_rect.h:
+            self.display.present()
+        else:
+            self.display.present(dirty)
+
+        self.previous_rects = rects
 
-        for ship in (*self.player_ships.values(),):
-            if ship:
-                objects.append(ship)
-        for enemy_types in (*self.enemies.values(),):
-            for enemy in enemy_types:
-                if enemy:
-                    objects.append(enemy)
-        for player_bullets in (*self.player_bullets.values(),):
-            for player_bullet in player_bullets:
-                if player_bullet:
-                    objects.append(player_bullet)
-        for enemies_bullets in (self.enemy_bullets.values(),):
-            for enemy_bullets in enemies_bullets:
-                for enemy_bullet in enemy_bullets:
-                    if enemy_bullet:
-                        objects.append(enemy_bullet)
-
-        return objects
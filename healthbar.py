@@ -0,0 +1,56 @@
+import pygame.draw
+from collections import OrderedDict
+from pygame import Rect
+from pygame import Surface
+from pygame import SRCALPHA
+
+HEALTH_COLOR = (178, 31, 1)
+HEAL_COLOR = (93, 232, 141)
+DAMAGE_COLOR = (232, 194, 93)
+OUTLINE_COLOR = (255, 255, 255)
+
+
+class HealthBar:
+    height = 10
+    bars = OrderedDict()
+    max_bars = 512
+
+    def __init__(self, max_health, ratio=1):
+        self.max_health = max_health
+        self.ratio = ratio
+        self.key = None
+        self.surface = None
+
+    @classmethod
+    def bar(cls, key):
+        surface = cls.bars.get(key)
+
+        if surface is None:
+            max_health, width, transition, color, mirrored = key
+            surface = Surface((max_health, cls.height), SRCALPHA)
+            left = max_health - width if mirrored else 0
+            transition_rect = Rect(left if mirrored else width, 0, -transition if mirrored else transition, cls.height)
+            transition_rect.normalize()
+
+            pygame.draw.rect(surface, HEALTH_COLOR, Rect(left, 0, width, cls.height))
+            pygame.draw.rect(surface, color, transition_rect)
+            pygame.draw.rect(surface, OUTLINE_COLOR, Rect(0, 0, max_health, cls.height), 2)
+
+            cls.bars[key] = surface
+            if len(cls.bars) > cls.max_bars:
+                cls.bars.popitem(last=False)
+        else:
+            cls.bars.move_to_end(key)
+
+        return surface
+
+    def draw(self, surface, topleft, current, target, mirrored=False):
+        transition = int((target - current) / self.ratio)
+        color = HEAL_COLOR if current < target else DAMAGE_COLOR if current > target else OUTLINE_COLOR
+        key = (self.max_health, int(current / self.ratio), transition, color, mirrored)
+
+        if key != self.key:
+            self.key = key
+            self.surface = self.bar(key)
+
+        return surface.blit(self.surface, topleft)
@@ -0,0 +1,39 @@
+from pygame import Surface
+from pygame import SRCALPHA
+from utils import print_text
+
+
+class Hud:
+    height = 110
+
+    def __init__(self, resolution, font):
+        self.width = resolution[0]
+        self.font = font
+        self.surface = Surface((self.width, self.height), SRCALPHA)
+        self.values = None
+        self.renders = 0
+
+    def render(self, values):
+        level, score, high_score, highest_level, player1_score, player2_score = values
+        self.surface.fill((0, 0, 0, 0))
+
+        print_text(self.surface, "Level : {:,}".format(level), self.font, (self.width, 15), 'score')
+        print_text(self.surface, "Score : {:,}".format(score), self.font, (self.width, 15 + 25), 'score')
+        print_text(self.surface, "High Score : {:,}".format(high_score), self.font, (self.width, 15 + 25 * 2),
+                   'score')
+        print_text(self.surface, "Highest Level : {:,}".format(highest_level), self.font,
+                   (self.width, 15 + 25 * 3), 'score')
+
+        print_text(self.surface, "Ship 1", self.font, (0, 15), "player1")
+        print_text(self.surface, "Ship 2", self.font, (self.width, 15), "player2")
+        print_text(self.surface, "{:,}".format(player1_score), self.font, (0, 15 + 25), "player1")
+        print_text(self.surface, "{:,}".format(player2_score), self.font, (self.width, 15 + 25), "player2")
+
+        self.values = values
+        self.renders += 1
+
+    def draw(self, surface, values):
+        if values != self.values:
+            self.render(values)
+
+        return surface.blit(self.surface, (0, 0))
@@ -1,13 +1,27 @@
-import pygame.draw
 from pygame.math import Vector2
-from pygame.transform import rotozoom
-from pygame import time
 from pygame import BLEND_RGB_ADD
+from pygame import Surface
+from pygame import transform
 from utils import load_sprite, load_animated_sprite, wrap_position, get_random_vel, get_random_time, glow
 from math import sin, atan2, cos
 from sounds import play_sound
+from assets import registry, rotations
+from clock import game_clock
+from healthbar import HealthBar
 
 UP = Vector2(0, -1)
+SPRITE_SCALE = 3
+
+SHIP_FRAMES = {
+    (False, False, False): 0,
+    (False, True, False): 1,
+    (True, True, False): 2,
+    (True, False, False): 3,
+    (False, True, True): 4,
+    (True, True, True): 5,
+    (True, False, True): 6,
+    (False, False, True): 7
+}
 
 
 class GameObject:
@@ -16,13 +30,24 @@ class GameObject:
         self.sprite = sprite
         self.radius = sprite.get_width()/2
         self.velocity = Vector2(velocity)
+        self.previous_position = Vector2(self.position)
+        self.handle = None
+
+    def render_position(self, alpha):
+        delta = self.position - self.previous_position
+        if alpha >= 1 or delta.length_squared() > 100 ** 2:
+            return self.position
+        return self.previous_position + delta * alpha
+
+    def draw(self, surface, alpha=1.0, scale=1):
+        return self.blit_sprite(surface, self.render_position(alpha), scale)
 
-    def draw(self, surface):
-        angle = self.direction.angle_to(UP)
-        rotated_surface = rotozoom(self.sprite, angle, 1.0)
+    def blit_sprite(self, surface, position, scale=1):
+        sprite = self.sprite if scale == 1 else registry.native(self.sprite)
+        rotated_surface = rotations.rotated(sprite, self.direction.angle_to(UP))
         rotated_surface_size = Vector2(rotated_surface.get_size())
-        blit_position = self.position - rotated_surface_size * 0.5
-        surface.blit(rotated_surface, blit_position)
+        blit_position = position / scale - rotated_surface_size * 0.5
+        return surface.blit(rotated_surface, blit_position)
 
     def move(self, surface):
         self.position = wrap_position(self.position + self.velocity, surface)
@@ -35,7 +60,7 @@ class GameObject:
 class PlayerBulletNormal(GameObject):
     def __init__(self, position, velocity):
         self.direction = velocity
-        super().__init__(position, load_sprite("PlayerBullet", True, 3), velocity)
+        super().__init__(position, load_sprite("PlayerBullet", True, SPRITE_SCALE), velocity)
 
     def move(self, surface):
         self.position = self.position + self.velocity
@@ -44,7 +69,7 @@ class PlayerBulletNormal(GameObject):
 class EnemyBulletNormal(GameObject):
     def __init__(self, position, velocity, name):
         self.direction = velocity
-        super().__init__(position, load_sprite(name, True, 3), velocity)
+        super().__init__(position, load_sprite(name, True, SPRITE_SCALE), velocity)
 
     def move(self, surface):
         self.position = self.position + self.velocity
@@ -56,21 +81,21 @@ class EnemyNormal(GameObject):
     health_drop_chance = 20
     fire_rate_drop_chance = 5
 
-    def __init__(self, position, create_bullet):
+    def __init__(self, position):
         self.current_health = self.max_health
         self.health_bar_length = self.max_health
         self.health_ratio = self.max_health / self.health_bar_length
         self.target_health = self.max_health
         self.health_change_speed = 1
+        self.health_bar = HealthBar(self.max_health, self.health_ratio)
 
         self.velocity = get_random_vel(3, 5)
         self.direction = self.velocity
-        self.create_bullet = create_bullet
 
-        self.last_shot = time.get_ticks()
+        self.last_shot = game_clock.get_ticks()
         self.cooldown = get_random_time(500, 700)
 
-        super().__init__(position, load_sprite("EnemyNormal", True, 3), self.velocity)
+        super().__init__(position, load_sprite("EnemyNormal", True, SPRITE_SCALE), self.velocity)
 
     def take_damage(self, damage):
         if self.target_health > 0:
@@ -78,42 +103,29 @@ class EnemyNormal(GameObject):
         if self.target_health <= 0:
             self.target_health = 0
 
-    def health(self, surface):
-        transition_width = 0
-        transition_color = (255, 255, 255)
-
+    def update_health(self):
         if self.current_health > self.target_health:
             self.current_health -= self.health_change_speed
-            transition_width = int((self.target_health - self.current_health)/self.health_ratio)
-            transition_color = (232, 194, 93)
 
-        bar_rect = pygame.Rect(self.position.x - self.health_bar_length/2, self.position.y + 30, self.current_health / self.health_ratio, 10)
-        transition_bar_rect = pygame.Rect(bar_rect.right, self.position.y + 30, transition_width, 10)
-        transition_bar_rect.normalize()
+    def health(self, surface, position):
+        return self.health_bar.draw(surface, (int(position.x - self.health_bar_length/2), int(position.y + 30)),
+                                    self.current_health, self.target_health)
 
-        pygame.draw.rect(surface, (178, 31, 1), bar_rect)
-        pygame.draw.rect(surface, transition_color, transition_bar_rect)
-        pygame.draw.rect(surface, (255, 255, 255), pygame.Rect(self.position.x - self.health_bar_length/2, self.position.y + 30, self.max_health, 10), 2)
+    def draw(self, surface, alpha=1.0, scale=1):
+        position = self.render_position(alpha)
+        sprite_rect = self.blit_sprite(surface, position, scale)
 
-    def draw(self, surface):
-        angle = self.direction.angle_to(UP)
-        rotated_surface = rotozoom(self.sprite, angle, 1.0)
-        rotated_surface_size = Vector2(rotated_surface.get_size())
-        blit_position = self.position - rotated_surface_size * 0.5
-        surface.blit(rotated_surface, blit_position)
-
-        self.health(surface)
+        if scale != 1:
+            return sprite_rect
+        return sprite_rect.union(self.health(surface, position))
 
-    def shoot(self):
-        current_time = time.get_ticks()
-
-        if current_time - self.last_shot >= self.cooldown:
-            self.last_shot = current_time
+    def move(self, surface):
+        super().move(surface)
+        self.update_health()
 
-            bullet_velocity = self.direction * self.bullet_speed + self.velocity
-            bullet = EnemyBulletNormal(self.position, bullet_velocity, "Bullet")
-            self.create_bullet(bullet)
-            play_sound("normal_enemy", "shoot", 0.1)
+    def fire(self, now):
+        self.last_shot = now
+        return EnemyBulletNormal(self.position, self.direction * self.bullet_speed + self.velocity, "Bullet")
 
 
 class EnemySlow(GameObject):
@@ -122,21 +134,21 @@ class EnemySlow(GameObject):
     health_drop_chance = 10
     fire_rate_drop_chance = 10
 
-    def __init__(self, position, create_bullet):
+    def __init__(self, position):
         self.current_health = self.max_health
         self.health_bar_length = self.max_health
         self.health_ratio = self.max_health / self.health_bar_length
         self.target_health = self.max_health
         self.health_change_speed = 1
+        self.health_bar = HealthBar(self.max_health, self.health_ratio)
 
         self.velocity = get_random_vel(1, 2)
         self.direction = self.velocity
-        self.create_bullet = create_bullet
 
-        self.last_shot = time.get_ticks()
+        self.last_shot = game_clock.get_ticks()
         self.cooldown = get_random_time(500, 700)
 
-        super().__init__(position, load_sprite("EnemySlow", True, 3), self.velocity)
+        super().__init__(position, load_sprite("EnemySlow", True, SPRITE_SCALE), self.velocity)
 
     def take_damage(self, damage):
         if self.target_health > 0:
@@ -144,42 +156,29 @@ class EnemySlow(GameObject):
         if self.target_health <= 0:
             self.target_health = 0
 
-    def health(self, surface):
-        transition_width = 0
-        transition_color = (255, 255, 255)
-
+    def update_health(self):
         if self.current_health > self.target_health:
             self.current_health -= self.health_change_speed
-            transition_width = int((self.target_health - self.current_health)/self.health_ratio)
-            transition_color = (232, 194, 93)
 
-        bar_rect = pygame.Rect(self.position.x - self.health_bar_length/2, self.position.y + 30, self.current_health / self.health_ratio, 10)
-        transition_bar_rect = pygame.Rect(bar_rect.right, self.position.y + 30, transition_width, 10)
-        transition_bar_rect.normalize()
+    def health(self, surface, position):
+        return self.health_bar.draw(surface, (int(position.x - self.health_bar_length/2), int(position.y + 30)),
+                                    self.current_health, self.target_health)
 
-        pygame.draw.rect(surface, (178, 31, 1), bar_rect)
-        pygame.draw.rect(surface, transition_color, transition_bar_rect)
-        pygame.draw.rect(surface, (255, 255, 255), pygame.Rect(self.position.x - self.health_bar_length/2, self.position.y + 30, self.max_health, 10), 2)
+    def draw(self, surface, alpha=1.0, scale=1):
+        position = self.render_position(alpha)
+        sprite_rect = self.blit_sprite(surface, position, scale)
 
-    def draw(self, surface):
-        angle = self.direction.angle_to(UP)
-        rotated_surface = rotozoom(self.sprite, angle, 1.0)
-        rotated_surface_size = Vector2(rotated_surface.get_size())
-        blit_position = self.position - rotated_surface_size * 0.5
-        surface.blit(rotated_surface, blit_position)
+        if scale != 1:
+            return sprite_rect
+        return sprite_rect.union(self.health(surface, position))
 
-        self.health(surface)
-
-    def shoot(self):
-        current_time = time.get_ticks()
-
-        if current_time - self.last_shot >= self.cooldown:
-            self.last_shot = current_time
+    def move(self, surface):
+        super().move(surface)
+        self.update_health()
 
-            bullet_velocity = self.direction * self.bullet_speed + self.velocity
-            bullet = EnemyBulletNormal(self.position, bullet_velocity, "SlowBullet")
-            self.create_bullet(bullet)
-            play_sound("normal_enemy", "shoot", 0.1)
+    def fire(self, now):
+        self.last_shot = now
+        return EnemyBulletNormal(self.position, self.direction * self.bullet_speed + self.velocity, "SlowBullet")
 
 
 class SpaceShip(GameObject):
@@ -195,20 +194,23 @@ class SpaceShip(GameObject):
         self.health_ratio = self.max_health / self.health_bar_length
         self.target_health = health
         self.health_change_speed = 1
+        self.health_bar = HealthBar(self.max_health, self.health_ratio)
 
         self.create_rocket = create_rocket
         self.cooldown = 200
-        self.last_shot = time.get_ticks()
+        self.reloaded = False
+        game_clock.after(self.cooldown, self.reload)
         self.direction = Vector2(UP)
 
-        self.shooting = 0
-        self.accelerating = 0
-        self.deaccelerating = 0
+        self.shooting = False
+        self.accelerating = False
+        self.deaccelerating = False
+        self.animations = {}
 
         self.spaceship_states = []
 
         for i in range(8):
-            self.spaceship_states.append(load_animated_sprite("Spaceship", i, 13, 15, 3))
+            self.spaceship_states.append(load_animated_sprite("Spaceship", i, 13, 15, SPRITE_SCALE))
 
         super().__init__(position, self.spaceship_states[0], Vector2(0))
 
@@ -219,22 +221,30 @@ class SpaceShip(GameObject):
 
     def accelerate(self):
         self.velocity += self.direction * self.acceleration
-        self.accelerating = 2
+        self.animate("accelerating")
 
     def deaccelerate(self):
         self.velocity -= self.direction * self.acceleration
-        self.deaccelerating = 2
+        self.animate("deaccelerating")
 
+    def animate(self, state):
+        setattr(self, state, True)
+        if state in self.animations:
+            game_clock.cancel(self.animations[state])
+        self.animations[state] = game_clock.after_ticks(2, setattr, self, state, False)
+
+    def reload(self):
+        self.reloaded = True
 
-    def shoot(self):
-        current_time = time.get_ticks()
 
-        if current_time - self.last_shot >= self.cooldown:
-            self.last_shot = current_time
+    def shoot(self):
+        if self.reloaded:
+            self.reloaded = False
+            game_clock.after(self.cooldown, self.reload)
             bullet_velocity = self.direction * self.rocket_speed + 1.5 * self.velocity
             bullet = PlayerBulletNormal(self.position, bullet_velocity)
             bullet.position = self.position + bullet_velocity
-            self.shooting = 2
+            self.animate("shooting")
             self.create_rocket(bullet)
             play_sound("player", "shoot")
 
@@ -250,68 +260,22 @@ class SpaceShip(GameObject):
         if self.target_health >= self.max_health:
             self.target_health = self.max_health
 
-    def health(self, surface, x, y, player):
-        transition_width = 0
-        transition_color = (255, 255, 255)
-
+    def update_health(self):
         if self.current_health < self.target_health:
             self.current_health += self.health_change_speed
-            transition_width = int((self.target_health - self.current_health)/self.health_ratio)
-            transition_color = (93, 232, 141)
         if self.current_health > self.target_health:
             self.current_health -= self.health_change_speed
-            transition_width = int((self.target_health - self.current_health)/self.health_ratio)
-            transition_color = (232, 194, 93)
-
-        if player == 1:
-            bar_rect = pygame.Rect(x, y, self.current_health / self.health_ratio, 10)
-            transition_bar_rect = pygame.Rect(bar_rect.right, y, transition_width, 10)
-            transition_bar_rect.normalize()
-            max_rect = pygame.Rect(x, y, self.max_health, 10)
-        elif player == 2:
-            bar_rect = pygame.Rect(x, y, self.current_health / self.health_ratio, 10)
-            bar_rect.right = x - 15
-            transition_bar_rect = pygame.Rect(bar_rect.left, y, -transition_width, 10)
-            transition_bar_rect.normalize()
-            max_rect = pygame.Rect(x, y, self.max_health, 10)
-            max_rect.right = x - 15
-
-        pygame.draw.rect(surface, (178, 31, 1), bar_rect)
-        pygame.draw.rect(surface, transition_color, transition_bar_rect)
-        pygame.draw.rect(surface, (255, 255, 255), max_rect, 2)
+
+    def health(self, surface, x, y, player):
+        mirrored = player == 2
+        left = x - 15 - self.max_health if mirrored else x
+        return self.health_bar.draw(surface, (left, y), self.current_health, self.target_health, mirrored)
 
     def move(self, surface):
         self.position = wrap_position(self.position + self.velocity, surface)
+        self.update_health()
 
-        if self.accelerating > 0:
-            self.accelerating -= 1
-        if self.shooting > 0:
-            self.shooting -= 1
-        if self.deaccelerating > 0:
-            self.deaccelerating -= 1
-
-        if self.accelerating == 0 and self.shooting == 0 and self.deaccelerating == 0:
-            self.sprite = self.spaceship_states[0]
-        if self.accelerating == 1 and self.shooting == 1 and self.deaccelerating == 1:
-            self.sprite = self.spaceship_states[5]
-
-        if self.accelerating == 1 and self.shooting == 0 and self.deaccelerating == 0:
-            self.sprite = self.spaceship_states[3]
-        if self.accelerating == 1 and self.shooting == 1 and self.deaccelerating == 0:
-            self.sprite = self.spaceship_states[2]
-
-        if self.accelerating == 0 and self.shooting == 1 and self.deaccelerating == 0:
-            self.sprite = self.spaceship_states[1]
-        if self.accelerating == 0 and self.shooting == 1 and self.deaccelerating == 1:
-            self.sprite = self.spaceship_states[4]
-
-        if self.accelerating == 0 and self.shooting == 0 and self.deaccelerating == 1:
-            self.sprite = self.spaceship_states[7]
-        if self.accelerating == 0 and self.shooting == 1 and self.deaccelerating == 1:
-            self.sprite = self.spaceship_states[4]
-
-        if self.accelerating == 1 and self.shooting == 0 and self.deaccelerating == 1:
-            self.sprite = self.spaceship_states[6]
+        self.sprite = self.spaceship_states[SHIP_FRAMES[self.accelerating, self.shooting, self.deaccelerating]]
 
         if self.velocity.x > self.max_speed:
             self.velocity.x = self.max_speed
@@ -325,6 +289,8 @@ class SpaceShip(GameObject):
 
 class Shard(GameObject):
     healing_factor = 25
+    glows = {}
+    downscaled = {}
 
     def __init__(self, position, sprite, velocity, color1, color2):
         self.current_time = 0
@@ -336,16 +302,49 @@ class Shard(GameObject):
         super().__init__(position, sprite, velocity)
 
         self.size = self.sx, self.sy = self.sprite.get_size()
+        self.glow = self.glow_surface(self.sx, self.sy, color1, color2)
+
+    @classmethod
+    def glow_surface(cls, sx, sy, color1, color2):
+        key = (sx, sy, color1, color2)
+        glow_surface = cls.glows.get(key)
+
+        if glow_surface is None:
+            outer = glow(sx * 2, sy * 2, color1)
+            glow_surface = Surface(outer.get_size())
+            glow_surface.blit(outer, (0, 0), special_flags=BLEND_RGB_ADD)
+            glow_surface.blit(glow(sx * 1.5, sy * 1.5, color2), (sx * 0.75, sy * 0.75), special_flags=BLEND_RGB_ADD)
+
+            glow_surface = glow_surface.subsurface((sx * 2, sy * 2, sx * 2, sy * 2)).copy()
+            glow_surface.set_colorkey((0, 0, 0))
+            cls.glows[key] = glow_surface
+
+        return glow_surface
+
+    @classmethod
+    def downscaled_sprite(cls, sprite, scale):
+        key = (sprite, scale)
+        downscaled = cls.downscaled.get(key)
+
+        if downscaled is None:
+            sx, sy = sprite.get_size()
+            downscaled = transform.scale(sprite, (max(1, round(sx / scale)), max(1, round(sy / scale))))
+            cls.downscaled[key] = downscaled
+
+        return downscaled
+
+    def draw(self, surface, alpha=1.0, scale=1):
+        sprite, glow_surface, (sx, sy) = self.sprite, self.glow, self.size
+        if scale != 1:
+            sprite = self.downscaled_sprite(self.sprite, scale)
+            sx, sy = sprite.get_size()
+            glow_surface = self.glow_surface(sx, sy, self.color1, self.color2)
 
-    def draw(self, surface):
-        blit_position = self.position - Vector2(self.radius)
-        a = lambda x: x+(x-1)/2
-        surface.blit(glow(self.sx * 2, self.sy * 2, self.color1),
-                     (blit_position.x - self.sx * a(2), blit_position.y - self.sy * a(2)), special_flags=BLEND_RGB_ADD)
-        surface.blit(glow(self.sx * 1.5, self.sy * 1.5, self.color2),
-                     (blit_position.x - self.sx * a(1.5), blit_position.y - self.sy * a(1.5)), special_flags=BLEND_RGB_ADD)
+        blit_position = (self.render_position(alpha) - Vector2(self.radius)) / scale
+        glow_rect = surface.blit(glow_surface, (blit_position.x - sx * 0.5, blit_position.y - sy * 0.5),
+                                 special_flags=BLEND_RGB_ADD)
 
-        surface.blit(self.sprite, blit_position)
+        return glow_rect.union(surface.blit(sprite, blit_position))
 
     def move(self, surface):
         self.current_time += 1
@@ -358,8 +357,7 @@ class Shard(GameObject):
         dx = px - ix
         dy = py - iy
         angle = atan2(dy, dx)
-        self.position.x += 2 * cos(angle)
-        self.position.y += 4 * sin(angle)
+        self.position = self.position + Vector2(2 * cos(angle), 4 * sin(angle))
 
 
 class HealthShard(Shard):
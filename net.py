@@ -0,0 +1,479 @@
+import asyncio
+import random
+import struct
+import threading
+import weakref
+import zlib
+from collections import OrderedDict, deque
+from time import perf_counter
+
+import numpy as np
+from pygame.math import Vector2
+from models import UP, SpaceShip, EnemyNormal, EnemySlow, HealthShard, FireRateShard, PlayerBulletNormal, \
+    EnemyBulletNormal
+from controls import apply_actions, SHOOT
+from sounds import SOUND_IDS, play_sound, flush_sounds, capture_sounds, take_captured_sounds
+from clock import game_clock
+from assets import texts
+
+INPUT = 1
+SNAPSHOT = 2
+
+INPUT_HEADER = struct.Struct("<BIB")
+INPUT_ENTRY = struct.Struct("<IBB")
+SNAPSHOT_HEADER = struct.Struct("<BIII")
+GLOBALS = struct.Struct("<IIQQQBB")
+COUNT = struct.Struct("<I")
+KEY = struct.Struct("<I")
+ENTITY = struct.Struct("<BhhhhhhB")
+BULLET = struct.Struct("<BIffff")
+SOUND = struct.Struct("<BHB")
+
+ENTITY_TYPES = (SpaceShip, EnemyNormal, EnemySlow, HealthShard, FireRateShard)
+ENTITY_KINDS = ("ships", "normal", "slow", "items", "items")
+SHIP_IDS = {"player1": 1, "player2": 2}
+BULLET_SPRITES = {"normal": "Bullet", "slow": "SlowBullet"}
+
+POSITION_SCALE = 4
+VELOCITY_SCALE = 64
+ANGLE_SCALE = 10
+INPUT_REDUNDANCY = 4
+INPUT_BUFFER = 2
+HISTORY = 32
+
+
+def encode_entity(entity):
+    type_id = ENTITY_TYPES.index(type(entity))
+    angle = entity.direction.angle_to(UP) if type_id < 3 else 0
+    frame = entity.spaceship_states.index(entity.sprite) if type_id == 0 else 0
+
+    return ENTITY.pack(type_id, round(entity.position.x * POSITION_SCALE), round(entity.position.y * POSITION_SCALE),
+                       round(entity.velocity.x * VELOCITY_SCALE), round(entity.velocity.y * VELOCITY_SCALE),
+                       round(((angle + 180) % 360 - 180) * ANGLE_SCALE), round(getattr(entity, "target_health", 0)),
+                       frame)
+
+
+def update_entity(entity, record):
+    type_id, x, y, vx, vy, angle, health, frame = ENTITY.unpack(record)
+
+    entity.position = Vector2(x, y) / POSITION_SCALE
+    entity.velocity = Vector2(vx, vy) / VELOCITY_SCALE
+    if type_id < 3:
+        entity.direction = UP.rotate(-angle / ANGLE_SCALE)
+        entity.target_health = health
+    if type_id == 0:
+        entity.sprite = entity.spaceship_states[frame]
+
+
+def encode_delta(baseline, current):
+    changed = [(key, record) for key, record in current.items() if baseline.get(key) != record]
+    removed = [key for key in baseline if key not in current]
+
+    return b"".join((COUNT.pack(len(changed)), *(KEY.pack(key) + record for key, record in changed),
+                     COUNT.pack(len(removed)), *(KEY.pack(key) for key in removed)))
+
+
+def decode_delta(data, offset, baseline, size):
+    state = dict(baseline)
+
+    (count,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    for _ in range(count):
+        (key,) = KEY.unpack_from(data, offset)
+        state[key] = data[offset + KEY.size:offset + KEY.size + size]
+        offset += KEY.size + size
+
+    (count,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    for _ in range(count):
+        (key,) = KEY.unpack_from(data, offset)
+        state.pop(key, None)
+        offset += KEY.size
+
+    return state, offset
+
+
+def encode_sounds(sounds):
+    return COUNT.pack(len(sounds)) + b"".join(
+        SOUND.pack(SOUND_IDS.index(key), min(count, 0xffff), round(min(volume, 1) * 255))
+        for key, (count, volume) in sounds.items())
+
+
+def decode_sounds(data, offset):
+    (count,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    sounds = []
+
+    for _ in range(count):
+        sound_id, repeats, volume = SOUND.unpack_from(data, offset)
+        sounds.append((*SOUND_IDS[sound_id], volume / 255, repeats))
+        offset += SOUND.size
+
+    return sounds, offset
+
+
+def play_sounds(sounds):
+    for category, name, volume, count in sounds:
+        play_sound(category, name, volume, count)
+
+
+def encode_globals(boom):
+    return GLOBALS.pack(game_clock.ticks, boom.level, int(boom.score), int(boom.player_scores["player1"]),
+                        int(boom.player_scores["player2"]), boom.game_start, bool(boom.message))
+
+
+def predict(ship, mask, surface):
+    ship.move(surface)
+    apply_actions(ship, mask & ~SHOOT)
+
+
+class SnapshotSource:
+    def __init__(self):
+        self.ids = weakref.WeakKeyDictionary()
+        self.next_id = len(SHIP_IDS) + 1
+
+    def entity_id(self, entity):
+        entity_id = self.ids.get(entity)
+
+        if entity_id is None:
+            entity_id = self.ids[entity] = self.next_id
+            self.next_id += 1
+
+        return entity_id
+
+    def snapshot(self, boom):
+        entities = {SHIP_IDS[player]: encode_entity(ship) for player, ship in boom.player_ships.items() if ship}
+        for entity in boom.entities.each("normal", "slow", "items"):
+            entities[self.entity_id(entity)] = encode_entity(entity)
+
+        pool = boom.bullets
+        slots = np.flatnonzero(pool.alive)
+        born = (game_clock.ticks - pool.ages[slots]).tolist()
+        bullets = {
+            slot: BULLET.pack(owner, tick, *origin, *velocity)
+            for slot, owner, tick, origin, velocity in zip(slots.tolist(), pool.owner[slots].tolist(), born,
+                                                           pool.origins[slots].tolist(),
+                                                           pool.velocities[slots].tolist())
+        }
+
+        return entities, bullets
+
+
+class SnapshotView:
+    def __init__(self):
+        self.entities = {}
+        self.bullets = {}
+
+    def begin(self, boom):
+        self.entities.clear()
+        self.bullets.clear()
+        boom.entities.clear()
+        boom.bullets.reset()
+        boom.player_ships = {player: None for player in boom.player_ships}
+
+    def apply(self, boom, values, entities, bullets):
+        tick, boom.level, boom.score, player1_score, player2_score, game_start, lost = values
+        boom.player_scores = {"player1": player1_score, "player2": player2_score}
+        boom.game_start = bool(game_start)
+        boom.message = "You lost!" if lost else ""
+
+        for key in [key for key in self.entities if key not in entities]:
+            self.remove(boom, key, self.entities.pop(key)[1])
+        for key, record in entities.items():
+            current = self.entities.get(key)
+            if current is None:
+                self.entities[key] = record, self.create(boom, key, record)
+            elif current[0] != record:
+                update_entity(current[1], record)
+                self.entities[key] = record, current[1]
+
+        for key in [key for key in self.bullets if key not in bullets]:
+            boom.bullets.release((self.bullets.pop(key)[1],))
+        for key, record in bullets.items():
+            current = self.bullets.get(key)
+            if current is None or current[0] != record:
+                if current is not None:
+                    boom.bullets.release((current[1],))
+                self.bullets[key] = record, self.spawn_bullet(boom, record, tick)
+
+    def create(self, boom, key, record):
+        type_id, x, y, *_ = ENTITY.unpack(record)
+        entity_type = ENTITY_TYPES[type_id]
+        position = Vector2(x, y) / POSITION_SCALE
+
+        if entity_type is SpaceShip:
+            entity = SpaceShip(position, lambda bullet: None, 0)
+            boom.player_ships[[*SHIP_IDS][key - 1]] = entity
+        else:
+            entity = entity_type(position)
+
+        update_entity(entity, record)
+        entity.current_health = getattr(entity, "target_health", 0)
+        return boom.entities.add(ENTITY_KINDS[type_id], entity)
+
+    def remove(self, boom, key, entity):
+        boom.entities.remove(entity)
+        for player, ship in boom.player_ships.items():
+            if ship is entity:
+                boom.player_ships[player] = None
+
+    def spawn_bullet(self, boom, record, tick):
+        owner_id, born, x, y, vx, vy = BULLET.unpack(record)
+        owner = boom.bullets.owners[owner_id]
+        position = Vector2(x, y) + Vector2(vx, vy) * (tick - born)
+
+        if owner in SHIP_IDS:
+            bullet = PlayerBulletNormal(position, Vector2(vx, vy))
+        else:
+            bullet = EnemyBulletNormal(position, Vector2(vx, vy), BULLET_SPRITES[owner])
+
+        return boom.bullets.spawn(owner, bullet)
+
+
+class Link(asyncio.DatagramProtocol):
+    def __init__(self, latency=0, jitter=0, loss=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.shim_rng = random.Random()
+
+        self.transport = None
+        self.received = deque()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+        self.started = perf_counter()
+        self.packets_sent = 0
+        self.packets_received = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.dropped = 0
+
+    def open(self, local_address):
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(
+            self.loop.create_datagram_endpoint(lambda: self, local_addr=local_address), self.loop).result()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, address):
+        self.packets_received += 1
+        self.bytes_received += len(data)
+        self.received.append((data, address))
+
+    def send(self, data, address):
+        self.packets_sent += 1
+        self.bytes_sent += len(data)
+
+        if self.loss and self.shim_rng.random() < self.loss:
+            self.dropped += 1
+            return
+
+        delay = (self.latency + self.shim_rng.uniform(0, self.jitter)) / 1000
+        self.loop.call_soon_threadsafe(self.deliver, data, address, delay)
+
+    def deliver(self, data, address, delay):
+        if delay > 0:
+            self.loop.call_later(delay, self.transport.sendto, data, address)
+        else:
+            self.transport.sendto(data, address)
+
+    def poll(self):
+        while self.received:
+            yield self.received.popleft()
+
+    def stats(self):
+        elapsed = max(perf_counter() - self.started, 1e-9)
+
+        return {
+            "packets_sent": self.packets_sent,
+            "packets_received": self.packets_received,
+            "dropped": self.dropped,
+            "kbps_out": self.bytes_sent * 8 / elapsed / 1000,
+            "kbps_in": self.bytes_received * 8 / elapsed / 1000
+        }
+
+    def close(self):
+        if self.transport:
+            self.loop.call_soon_threadsafe(self.transport.close)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class NetPeer:
+    def __init__(self, local_address, latency=0, jitter=0, loss=0):
+        self.link = Link(latency, jitter, loss)
+        self.link.open(local_address)
+        self.history = OrderedDict()
+        self.rtt = None
+        self.font = None
+
+    def remember(self, seq, state):
+        self.history[seq] = state
+        while len(self.history) > HISTORY:
+            self.history.popitem(last=False)
+
+    def stats(self):
+        return {**self.link.stats(), "rtt_ms": self.rtt}
+
+    def draw(self, surface):
+        if self.font is None:
+            self.font = texts.font(20)
+
+        stats = self.stats()
+        rtt = "-" if stats["rtt_ms"] is None else f"{stats['rtt_ms']:.0f}"
+        text = texts.render(self.font, f"rtt {rtt} ms  in {stats['kbps_in']:.1f} kbps  "
+                                       f"out {stats['kbps_out']:.1f} kbps  dropped {stats['dropped']}",
+                            (200, 200, 200))
+
+        return surface.blit(text, (surface.get_width() - text.get_width() - 10, surface.get_height() - 26))
+
+    def close(self):
+        self.link.close()
+
+
+class NetHost(NetPeer):
+    def __init__(self, local_address, latency=0, jitter=0, loss=0):
+        super().__init__(local_address, latency, jitter, loss)
+        self.client = None
+        self.source = SnapshotSource()
+        capture_sounds()
+
+        self.seq = 0
+        self.acked = 0
+        self.inputs = deque()
+        self.last_input = 0
+        self.applied = 0
+        self.mask = 0
+
+    def receive(self):
+        for data, address in self.link.poll():
+            if data[0] != INPUT:
+                continue
+
+            self.client = address
+            _, ack, count = INPUT_HEADER.unpack_from(data)
+            self.acked = max(self.acked, ack)
+
+            for index in range(count):
+                seq, mask, start = INPUT_ENTRY.unpack_from(data, INPUT_HEADER.size + index * INPUT_ENTRY.size)
+                if seq > self.last_input:
+                    self.last_input = seq
+                    self.inputs.append((seq, mask, start))
+
+    def next_input(self):
+        start = False
+
+        while len(self.inputs) > INPUT_BUFFER:
+            start |= bool(self.inputs.popleft()[2])
+        if self.inputs:
+            self.applied, self.mask, remote_start = self.inputs.popleft()
+            start |= bool(remote_start)
+
+        return self.mask, start
+
+    def tick(self, boom, actions, start):
+        self.receive()
+        mask, remote_start = self.next_input()
+
+        boom.update({**actions, "player2": mask}, start or remote_start)
+        self.send_snapshot(boom)
+
+    def send_snapshot(self, boom):
+        entities, bullets = self.source.snapshot(boom)
+        sounds = take_captured_sounds()
+        baseline_seq = self.acked if self.acked in self.history else 0
+        baseline_entities, baseline_bullets = self.history.get(baseline_seq, ({}, {}))
+
+        self.seq += 1
+        self.remember(self.seq, (entities, bullets))
+        if self.client is None:
+            return
+
+        body = encode_globals(boom) + encode_sounds(sounds) + encode_delta(baseline_entities, entities) + \
+            encode_delta(baseline_bullets, bullets)
+        self.link.send(SNAPSHOT_HEADER.pack(SNAPSHOT, self.seq, baseline_seq, self.applied) + zlib.compress(body, 1),
+                       self.client)
+
+
+class NetClient(NetPeer):
+    def __init__(self, server_address, latency=0, jitter=0, loss=0):
+        super().__init__(("0.0.0.0", 0), latency, jitter, loss)
+        self.server = server_address
+        self.ack = 0
+        self.view = SnapshotView()
+
+        self.seq = 0
+        self.inputs = deque(maxlen=120)
+        self.sent = {}
+
+    def begin(self, boom):
+        self.view.begin(boom)
+
+    def tick(self, boom, actions, start):
+        local_ship = boom.player_ships["player2"]
+        for entity in boom.entities.each():
+            entity.previous_position = Vector2(entity.position)
+            if entity is not local_ship:
+                entity.move(boom.screen)
+        boom.bullets.move()
+
+        self.receive(boom)
+
+        mask = actions.get("player1", 0) | actions.get("player2", 0)
+        self.seq += 1
+        self.inputs.append((self.seq, mask, start))
+        self.sent[self.seq] = perf_counter()
+        if boom.player_ships["player2"]:
+            predict(boom.player_ships["player2"], mask, boom.screen)
+
+        entries = [*self.inputs][-INPUT_REDUNDANCY:]
+        self.link.send(INPUT_HEADER.pack(INPUT, self.ack, len(entries)) +
+                       b"".join(INPUT_ENTRY.pack(*entry) for entry in entries), self.server)
+
+        boom.entities.flush()
+        flush_sounds()
+        game_clock.advance()
+
+    def receive(self, boom):
+        newest = None
+
+        for data, address in self.link.poll():
+            if data[0] != SNAPSHOT:
+                continue
+
+            _, seq, baseline_seq, input_ack = SNAPSHOT_HEADER.unpack_from(data)
+            baseline = ({}, {}) if baseline_seq == 0 else self.history.get(baseline_seq)
+            if seq <= self.ack or baseline is None:
+                continue
+
+            body = zlib.decompress(data[SNAPSHOT_HEADER.size:])
+            sounds, offset = decode_sounds(body, GLOBALS.size)
+            entities, offset = decode_delta(body, offset, baseline[0], ENTITY.size)
+            bullets, offset = decode_delta(body, offset, baseline[1], BULLET.size)
+            self.remember(seq, (entities, bullets))
+            self.ack = seq
+            play_sounds(sounds)
+
+            sent = self.sent.get(input_ack)
+            if sent is not None:
+                sample = (perf_counter() - sent) * 1000
+                self.rtt = sample if self.rtt is None else self.rtt * 0.9 + sample * 0.1
+            for old in [old for old in self.sent if old <= input_ack]:
+                del self.sent[old]
+
+            newest = GLOBALS.unpack_from(body), entities, bullets, input_ack
+
+        if newest:
+            self.apply(boom, *newest)
+
+    def apply(self, boom, values, entities, bullets, input_ack):
+        self.view.apply(boom, values, entities, bullets)
+
+        ship = boom.player_ships["player2"]
+        while self.inputs and self.inputs[0][0] <= input_ack:
+            self.inputs.popleft()
+        if ship and SHIP_IDS["player2"] in entities:
+            update_entity(ship, entities[SHIP_IDS["player2"]])
+            for seq, mask, start in self.inputs:
+                predict(ship, mask, boom.screen)
@@ -0,0 +1,139 @@
+import json
+from collections import deque
+from time import perf_counter
+
+import pygame
+
+PHASES = ("handle_input", "game_logic", "move_objs", "draw")
+
+PHASE_COLORS = {
+    "handle_input": (93, 141, 232),
+    "game_logic": (232, 194, 93),
+    "move_objs": (93, 232, 141),
+    "draw": (232, 93, 141)
+}
+
+
+class Profiler:
+    def __init__(self, size=240, entities=False, entity_classes=()):
+        self.enabled = False
+        self.size = size
+        self.entities = entities
+        self.entity_classes = entity_classes
+
+        self.timings = {}
+        self.frames = {}
+        self.frame_times = deque(maxlen=size)
+        self.counts = deque(maxlen=size)
+        self.histogram = {}
+        self.last_frame = None
+
+        self.patched_methods = []
+        self.patched_classes = []
+        self.font = None
+
+    def timed(self, name, method):
+        timings = self.timings
+
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            result = method(*args, **kwargs)
+            timings[name] = timings.get(name, 0) + perf_counter() - start
+            return result
+
+        return wrapper
+
+    def attach(self, boom):
+        for phase in PHASES:
+            setattr(boom, phase, self.timed(phase, getattr(boom, phase)))
+            self.patched_methods.append((boom, phase))
+
+        if self.entities:
+            for cls in self.entity_classes:
+                for method in ("move", "draw"):
+                    original = cls.__dict__.get(method)
+                    setattr(cls, method, self.timed(f"{cls.__name__}.{method}", getattr(cls, method)))
+                    self.patched_classes.append((cls, method, original))
+
+    def detach(self):
+        for boom, phase in self.patched_methods:
+            delattr(boom, phase)
+        for cls, method, original in self.patched_classes:
+            if original is None:
+                delattr(cls, method)
+            else:
+                setattr(cls, method, original)
+
+        self.patched_methods.clear()
+        self.patched_classes.clear()
+
+    def toggle(self, boom):
+        self.enabled = not self.enabled
+
+        if self.enabled:
+            self.last_frame = None
+            self.attach(boom)
+        else:
+            self.detach()
+
+    def end_frame(self, bullets, enemies, items):
+        now = perf_counter()
+
+        for name in dict.fromkeys((*PHASES, *self.frames, *self.timings)):
+            self.frames.setdefault(name, deque(maxlen=self.size)).append(self.timings.get(name, 0.0))
+        self.timings.clear()
+        self.counts.append((bullets, enemies, items))
+
+        if self.last_frame is not None:
+            frame_time = (now - self.last_frame) * 1000
+            self.frame_times.append(frame_time)
+            self.histogram[int(frame_time)] = self.histogram.get(int(frame_time), 0) + 1
+        self.last_frame = now
+
+    def draw(self, surface):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+
+        left, bottom, height = 10, surface.get_height() - 10, 60
+        scale = height / 50
+
+        rect = pygame.draw.rect(surface, (40, 40, 40), pygame.Rect(left, bottom - height, self.size, height))
+        for x, frame_time in enumerate(self.frame_times):
+            pygame.draw.line(surface, (200, 200, 200), (left + x, bottom),
+                             (left + x, bottom - min(height, frame_time * scale)))
+
+        for x in range(len(self.frames.get("draw", ()))):
+            y = bottom
+            for phase in PHASES:
+                samples = self.frames.get(phase)
+                if samples and x < len(samples):
+                    top = y - samples[x] * 1000 * scale
+                    pygame.draw.line(surface, PHASE_COLORS[phase], (left + x, y), (left + x, max(bottom - height, top)))
+                    y = top
+
+        y = bottom - height - 18
+        for phase in (*PHASES[::-1], "frame"):
+            samples = self.frame_times if phase == "frame" else [sample * 1000 for sample in self.frames.get(phase, ())]
+            average = sum(samples) / len(samples) if samples else 0
+            text = self.font.render(f"{phase} {average:.2f} ms", True, PHASE_COLORS.get(phase, (255, 255, 255)))
+            rect.union_ip(surface.blit(text, (left, y)))
+            y -= 16
+
+        return rect
+
+    def report(self):
+        counts = [*self.counts]
+
+        return {
+            "frames": sum(self.histogram.values()),
+            "frame_time_histogram_ms": {str(bucket): self.histogram[bucket] for bucket in sorted(self.histogram)},
+            "phases_ms": {name: sum(samples) / len(samples) * 1000 for name, samples in self.frames.items() if samples},
+            "live": {
+                name: {"mean": sum(values) / len(values), "max": max(values)} if values else None
+                for name, values in zip(("bullets", "enemies", "items"), zip(*counts) if counts else ((), (), ()))
+            }
+        }
+
+    def dump(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.report(), file, indent=2)
@@ -0,0 +1,113 @@
+import pygame
+from pygame import Rect
+
+BACKENDS = ("surface", "sdl2")
+
+
+def spans(size, scale):
+    whole = size // scale
+    spans = [(0, whole, whole * scale)] if whole else []
+
+    if size % scale:
+        spans.append((whole, 1, size % scale))
+    return spans
+
+
+def fit(resolution, window_size):
+    width, height = resolution
+    window_width, window_height = window_size
+    scale = min(window_width // width, window_height // height)
+
+    if scale >= 1:
+        size = width * scale, height * scale
+    else:
+        scale = None
+        ratio = min(window_width / width, window_height / height)
+        size = max(1, int(width * ratio)), max(1, int(height * ratio))
+
+    target = Rect((0, 0), size)
+    target.center = window_width // 2, window_height // 2
+    return scale, target
+
+
+class Display:
+    def __init__(self, resolution, window_size=None, backend="surface", world_scale=1, title="Boom"):
+        self.resolution = tuple(resolution)
+        self.world_scale = world_scale
+        self.world_size = tuple(-(-size // world_scale) for size in self.resolution)
+        self.frame_size = self.resolution
+        self.window_size = tuple(window_size or self.frame_size)
+        self.backend = backend
+        self.scale, self.target = fit(self.frame_size, self.window_size)
+
+        self.window = None
+        self.renderer = None
+        self.texture = None
+        self.surface = None
+        self.view = None
+        self.world = None
+
+        if backend == "sdl2":
+            from pygame._sdl2 import video
+
+            pygame.display.set_mode((1, 1), pygame.HIDDEN)
+            self.window = video.Window(title, size=self.window_size)
+            self.renderer = video.Renderer(self.window)
+            self.texture = video.Texture(self.renderer, self.frame_size, streaming=True)
+            self.frame = pygame.Surface(self.frame_size).convert()
+        elif self.window_size == self.frame_size:
+            self.surface = pygame.display.set_mode(self.frame_size)
+            self.frame = self.surface
+        else:
+            self.surface = pygame.display.set_mode(self.window_size)
+            self.frame = pygame.Surface(self.frame_size).convert()
+            self.view = self.surface.subsurface(self.target)
+
+        self.canvas = self.frame
+        self.blocks = []
+        if world_scale > 1:
+            self.world = pygame.Surface(self.world_size).convert()
+            self.blocks = [
+                (self.world.subsurface((x, y, w, h)), (frame_w, frame_h),
+                 self.frame.subsurface((x * world_scale, y * world_scale, frame_w, frame_h)))
+                for x, w, frame_w in spans(self.resolution[0], world_scale)
+                for y, h, frame_h in spans(self.resolution[1], world_scale)
+            ]
+
+    def compose(self):
+        for source, size, target in self.blocks:
+            pygame.transform.scale(source, size, target)
+
+    def to_window(self, rect):
+        scale = self.scale
+        return Rect(self.target.x + rect.x * scale, self.target.y + rect.y * scale, rect.w * scale, rect.h * scale)
+
+    def present(self, rects=None):
+        if self.texture is not None:
+            if rects is None:
+                self.texture.update(self.frame)
+            else:
+                for rect in rects:
+                    if rect.w and rect.h:
+                        self.texture.update(self.frame.subsurface(rect), rect)
+
+            self.renderer.clear()
+            self.texture.draw(dstrect=self.target)
+            self.renderer.present()
+        elif self.frame is self.surface:
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+        elif rects is None or self.scale is None:
+            pygame.transform.scale(self.frame, self.target.size, self.view)
+            pygame.display.flip()
+        else:
+            window_rects = []
+            for rect in rects:
+                if rect.w and rect.h:
+                    window_rect = self.to_window(rect)
+                    pygame.transform.scale(self.frame.subsurface(rect), window_rect.size,
+                                           self.surface.subsurface(window_rect))
+                    window_rects.append(window_rect)
+            pygame.display.update(window_rects)
@@ -0,0 +1,87 @@
+import random
+import struct
+from clock import game_clock
+
+MAGIC = b"BOOMREC1"
+HEADER = struct.Struct("<8sQH")
+TICK = struct.Struct("<BBBI")
+PLAYERS = ("player1", "player2")
+
+
+def new_seed():
+    return random.SystemRandom().getrandbits(63)
+
+
+class InputRecorder:
+    def __init__(self, path, seed, tick_rate):
+        self.path = path
+        self.seed = seed
+        self.ticks = 0
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, seed, tick_rate))
+
+    def write(self, actions, start, checksum):
+        self.file.write(TICK.pack(*(actions.get(player, 0) for player in PLAYERS), bool(start), checksum))
+        self.ticks += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class InputLog:
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        magic, self.seed, self.tick_rate = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a Boom recording")
+
+        body = data[HEADER.size:len(data) - (len(data) - HEADER.size) % TICK.size]
+        self.ticks = [
+            ({player: mask for player, mask in zip(PLAYERS, (player1, player2))}, bool(start), checksum)
+            for player1, player2, start, checksum in TICK.iter_unpack(body)
+        ]
+
+    def __len__(self):
+        return len(self.ticks)
+
+
+class Replay:
+    def __init__(self, log, verify=True):
+        self.log = log
+        self.verify = verify
+        self.tick = 0
+        self.diverged_at = None
+
+    def begin(self, boom):
+        game_clock.set_tick_rate(self.log.tick_rate)
+        boom.reset(self.log.seed)
+        boom.scores.persist = False
+
+    def step(self, boom):
+        if self.tick >= len(self.log):
+            return False
+
+        actions, start, checksum = self.log.ticks[self.tick]
+        boom.update(actions, start)
+        if self.verify and self.diverged_at is None and boom.checksum() != checksum:
+            self.diverged_at = self.tick
+        self.tick += 1
+
+        return True
+
+    def run(self, boom):
+        while self.step(boom):
+            pass
+        return self.report(boom)
+
+    def report(self, boom):
+        return {
+            "ticks": self.tick,
+            "recorded_ticks": len(self.log),
+            "seed": self.log.seed,
+            "diverged_at": self.diverged_at,
+            "checksum": boom.checksum()
+        }
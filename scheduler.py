@@ -0,0 +1,36 @@
+import heapq
+from itertools import count
+
+
+class Scheduler:
+    def __init__(self):
+        self.queue = []
+        self.order = count()
+
+    def schedule(self, time, item):
+        entry = [time, next(self.order), item]
+        heapq.heappush(self.queue, entry)
+        return entry
+
+    def cancel(self, entry):
+        entry[2] = None
+
+    def due(self, now):
+        items = []
+        queue = self.queue
+
+        while queue and queue[0][0] <= now:
+            item = heapq.heappop(queue)[2]
+            if item is not None:
+                items.append(item)
+
+        return items
+
+    def next_time(self):
+        return self.queue[0][0] if self.queue else None
+
+    def clear(self):
+        self.queue.clear()
+
+    def __len__(self):
+        return len(self.queue)
@@ -0,0 +1,122 @@
+import json
+import os
+import queue
+import threading
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+from utils import read_high_score, write_atomic
+
+
+class ScoreStore:
+    persist = True
+
+    def __init__(self, path='high score.txt', leaderboard_path='leaderboard.json', size=10, history_size=100):
+        self.path = path
+        self.leaderboard_path = leaderboard_path
+        self.size = size
+        self.history_size = history_size
+
+        self.high_score = int(read_high_score('score', path).replace('\n1', ""))
+        self.highest_level = int(read_high_score('level', path))
+
+        self.runs = []
+        self.keys = []
+        self.history = {}
+        self.load_leaderboard()
+
+        self.flushes = queue.Queue()
+        self.writer = None
+
+    def load_leaderboard(self):
+        if not os.path.exists(self.leaderboard_path):
+            return
+
+        with open(self.leaderboard_path, 'r') as file:
+            data = json.load(file)
+
+        for run in data.get("runs", []):
+            self.insert_run(run)
+        for player, scores in data.get("history", {}).items():
+            self.history[player] = deque(scores, maxlen=self.history_size)
+
+    def submit_score(self, score):
+        if score > self.high_score:
+            self.high_score = score
+
+    def submit_level(self, level):
+        if level > self.highest_level:
+            self.highest_level = level
+
+    def insert_run(self, run):
+        index = bisect_right(self.keys, -run["score"])
+        if index >= self.size:
+            return None
+
+        self.keys.insert(index, -run["score"])
+        self.runs.insert(index, run)
+        del self.keys[self.size:], self.runs[self.size:]
+        return index
+
+    def record_run(self, score, level, player_scores):
+        self.submit_score(score)
+        self.submit_level(level)
+
+        for player, player_score in player_scores.items():
+            self.history.setdefault(player, deque(maxlen=self.history_size)).append(player_score)
+
+        return self.insert_run({"score": score, "level": level, "players": dict(player_scores)})
+
+    def rank(self, score):
+        return bisect_left(self.keys, -score)
+
+    def is_top(self, score):
+        return self.rank(score) < self.size
+
+    def snapshot(self):
+        return (
+            f"{self.high_score}\n{self.highest_level}",
+            json.dumps({"runs": self.runs, "history": {player: [*scores] for player, scores in self.history.items()}})
+        )
+
+    def write(self, snapshot):
+        if not self.persist:
+            return
+
+        high_scores, leaderboard = snapshot
+        write_atomic(self.path, high_scores)
+        write_atomic(self.leaderboard_path, leaderboard)
+
+    def run_writer(self):
+        while True:
+            snapshot = self.flushes.get()
+            stop = snapshot is None
+
+            while not self.flushes.empty():
+                latest = self.flushes.get()
+                if latest is None:
+                    stop = True
+                else:
+                    snapshot = latest
+
+            if snapshot is not None:
+                self.write(snapshot)
+            if stop:
+                return
+
+    def flush(self, background=True):
+        if not background:
+            self.close()
+            self.write(self.snapshot())
+            return
+
+        if self.writer is None or not self.writer.is_alive():
+            self.writer = threading.Thread(target=self.run_writer, daemon=True)
+            self.writer.start()
+        self.flushes.put(self.snapshot())
+
+    def close(self):
+        if self.writer is not None and self.writer.is_alive():
+            self.flushes.put(None)
+            self.writer.join()
+        self.writer = None
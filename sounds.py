@@ -1,37 +1,173 @@
+import os
 import pygame
 from pygame import mixer
 
-pygame.init()
-
 
 def path(name):
     return f"Assets/Sounds/{name}.wav"
 
 
-player_dict = {
-    "shoot": mixer.Sound(path("PlayerShoot")),
-    "explosion": mixer.Sound(path("PlayerExplosion")),
+SOUND_FILES = {
+    "player": {
+        "shoot": "PlayerShoot",
+        "explosion": "PlayerExplosion"
+    },
+    "normal_enemy": {
+        "shoot": "EnemyShoot",
+        "hurt": "EnemyHurt",
+        "explosion": "EnemyExplosion"
+    },
+    "misc": {
+        "new_level": "NewLevel",
+        "item_pickup": "ItemPickup"
+    }
 }
 
-normal_enemy_dict = {
-    "shoot": mixer.Sound(path("EnemyShoot")),
-    "hurt": mixer.Sound(path("EnemyHurt")),
-    "explosion": mixer.Sound(path("EnemyExplosion"))
+player_dict = {}
+normal_enemy_dict = {}
+misc_dict = {}
+
+sound_dicts = {
+    "player": player_dict,
+    "normal_enemy": normal_enemy_dict,
+    "misc": misc_dict
 }
 
-misc_dict = {
-    "new_level": mixer.Sound(path("NewLevel")),
-    "item_pickup": mixer.Sound(path("ItemPickup"))
+CHANNELS = {
+    "player": 3,
+    "normal_enemy": 6,
+    "misc": 2
+}
+
+SOUND_IDS = [(category, name) for category, files in SOUND_FILES.items() for name in files]
+
+VOICE_LIMITS = {
+    ("normal_enemy", "shoot"): 3,
+    ("normal_enemy", "hurt"): 2,
+    ("normal_enemy", "explosion"): 3
 }
 
 
-def play_sound(object, sound, volume=1):
-    if object == "player":
-        player_dict[f"{sound}"].set_volume(volume)
-        player_dict[f"{sound}"].play()
-    elif object == "normal_enemy":
-        normal_enemy_dict[f"{sound}"].set_volume(volume)
-        normal_enemy_dict[f"{sound}"].play()
-    elif object == "misc":
-        misc_dict[f"{sound}"].set_volume(volume)
-        misc_dict[f"{sound}"].play()
+class SoundManager:
+    def __init__(self, sounds, channels, voice_limits, default_voice_limit=2):
+        self.sounds = sounds
+        self.voice_limits = voice_limits
+        self.default_voice_limit = default_voice_limit
+        self.channels = channels
+        self.muted = False
+        self.captured = None
+
+        self.groups = {}
+        self.next_channel = {}
+        self.pending = {}
+        self.played = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def open(self):
+        mixer.set_num_channels(max(mixer.get_num_channels(), sum(self.channels.values())))
+        mixer.set_reserved(sum(self.channels.values()))
+
+        first = 0
+        for category, count in self.channels.items():
+            self.groups[category] = [mixer.Channel(index) for index in range(first, first + count)]
+            self.next_channel[category] = 0
+            first += count
+
+    def play(self, category, name, volume=1, count=1):
+        key = (category, name)
+
+        if self.captured is not None:
+            captured = self.captured.get(key)
+            if captured is None:
+                self.captured[key] = [count, volume]
+            else:
+                captured[0] += count
+                captured[1] = max(captured[1], volume)
+
+        if self.muted or not self.groups:
+            return
+
+        pending = self.pending.get(key)
+
+        if pending is None:
+            self.pending[key] = [count, volume]
+        else:
+            pending[0] += count
+            pending[1] = max(pending[1], volume)
+            self.coalesced += count
+
+    def channel_for(self, category, sound, voice_limit):
+        if sound.get_num_channels() >= voice_limit:
+            return None
+
+        group = self.groups[category]
+        for channel in group:
+            if not channel.get_busy():
+                return channel
+
+        index = self.next_channel[category]
+        self.next_channel[category] = (index + 1) % len(group)
+        return group[index]
+
+    def flush(self):
+        for (category, name), (count, volume) in self.pending.items():
+            sound = self.sounds[category][name]
+            channel = self.channel_for(category, sound, self.voice_limits.get((category, name), self.default_voice_limit))
+
+            if channel is None:
+                self.dropped += 1
+                continue
+
+            channel.play(sound)
+            channel.set_volume(min(1.0, volume * count ** 0.5))
+            self.played += 1
+
+        self.pending.clear()
+
+
+manager = SoundManager(sound_dicts, CHANNELS, VOICE_LIMITS)
+
+
+def init_audio():
+    if mixer.get_init():
+        return
+
+    try:
+        mixer.init()
+    except pygame.error:
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+        mixer.init()
+
+
+def load_sounds():
+    init_audio()
+
+    for category, files in SOUND_FILES.items():
+        for name, file in files.items():
+            sound_dicts[category][name] = mixer.Sound(path(file))
+
+    manager.open()
+
+
+def mute(value=True):
+    manager.muted = value
+    manager.pending.clear()
+
+
+def play_sound(object, sound, volume=1, count=1):
+    manager.play(object, sound, volume, count)
+
+
+def flush_sounds():
+    manager.flush()
+
+
+def capture_sounds():
+    manager.captured = {}
+
+
+def take_captured_sounds():
+    captured = manager.captured or {}
+    manager.captured = {}
+    return captured
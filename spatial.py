@@ -0,0 +1,58 @@
+from math import floor
+
+
+class SpatialHash:
+    def __init__(self, width, height, cell_size=64):
+        self.cell_size = cell_size
+        self.columns = max(1, -(-width // cell_size))
+        self.rows = max(1, -(-height // cell_size))
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def cell_range(self, x, y, radius):
+        left = floor((x - radius) / self.cell_size)
+        right = floor((x + radius) / self.cell_size)
+        top = floor((y - radius) / self.cell_size)
+        bottom = floor((y + radius) / self.cell_size)
+
+        columns = range(left, right + 1) if right - left < self.columns else range(self.columns)
+        rows = range(top, bottom + 1) if bottom - top < self.rows else range(self.rows)
+
+        return {(column % self.columns, row % self.rows) for column in columns for row in rows}
+
+    def insert(self, obj, value=None):
+        value = obj if value is None else value
+
+        for cell in self.cell_range(obj.position.x, obj.position.y, obj.radius):
+            self.cells.setdefault(cell, []).append(value)
+
+    def query_radius(self, position, radius):
+        found = {}
+
+        for cell in self.cell_range(position.x, position.y, radius):
+            for value in self.cells.get(cell, ()):
+                found[value] = None
+
+        return [*found]
+
+    def query(self, obj):
+        return self.query_radius(obj.position, obj.radius)
+
+
+class BruteForce:
+    def __init__(self, width, height, cell_size=64):
+        self.values = []
+
+    def clear(self):
+        self.values.clear()
+
+    def insert(self, obj, value=None):
+        self.values.append(obj if value is None else value)
+
+    def query_radius(self, position, radius):
+        return [*self.values]
+
+    def query(self, obj):
+        return self.query_radius(obj.position, obj.radius)
@@ -0,0 +1,243 @@
+import multiprocessing
+import queue
+import struct
+from multiprocessing.shared_memory import SharedMemory
+from time import perf_counter, sleep
+
+from pygame.math import Vector2
+from clock import game_clock
+from net import GLOBALS, KEY, ENTITY, BULLET, SOUND, SnapshotSource, SnapshotView, encode_globals, play_sounds
+from sounds import SOUND_IDS, flush_sounds, capture_sounds, take_captured_sounds
+from assets import texts
+
+MAX_ENTITIES = 512
+MAX_BULLETS = 4096
+SOUND_RING = 256
+SETTINGS = ("seed", "tick_rate", "max_ticks_per_frame", "broad_phase", "cell_size", "event_log_path")
+
+CONTROL = struct.Struct("<BdQ")
+SLOT_HEADER = struct.Struct("<QII")
+ENTITY_ROW = KEY.size + ENTITY.size
+BULLET_ROW = KEY.size + BULLET.size
+SLOT_SIZE = SLOT_HEADER.size + GLOBALS.size + MAX_ENTITIES * ENTITY_ROW + MAX_BULLETS * BULLET_ROW
+SOUNDS_START = CONTROL.size + 2 * SLOT_SIZE
+
+
+def pack_rows(records, limit):
+    rows = [KEY.pack(key) + record for key, record in records.items()][:limit]
+    return len(rows), b"".join(rows)
+
+
+def unpack_rows(data, count, size):
+    rows = {}
+    row_size = KEY.size + size
+
+    for offset in range(0, count * row_size, row_size):
+        (key,) = KEY.unpack_from(data, offset)
+        rows[key] = data[offset + KEY.size:offset + row_size]
+
+    return rows
+
+
+class SnapshotBuffer:
+    def __init__(self, name=None):
+        self.owner = name is None
+        self.memory = SharedMemory(name=name, create=self.owner, size=SOUNDS_START + SOUND_RING * SOUND.size)
+        self.name = self.memory.name
+        self.buf = self.memory.buf
+        self.seq = 0
+        self.read_seq = 0
+        self.sound_head = 0
+        self.read_sound = 0
+
+        if self.owner:
+            CONTROL.pack_into(self.buf, 0, 0, 0, 0)
+            SLOT_HEADER.pack_into(self.buf, CONTROL.size, 0, 0, 0)
+            SLOT_HEADER.pack_into(self.buf, CONTROL.size + SLOT_SIZE, 0, 0, 0)
+
+    def write(self, globals, entities, bullets, sounds, tick_rate):
+        latest, *_ = CONTROL.unpack_from(self.buf, 0)
+        slot = 1 - latest
+        start = CONTROL.size + slot * SLOT_SIZE
+        body = start + SLOT_HEADER.size
+
+        entity_count, entity_rows = pack_rows(entities, MAX_ENTITIES)
+        bullet_count, bullet_rows = pack_rows(bullets, MAX_BULLETS)
+
+        self.seq += 2
+        SLOT_HEADER.pack_into(self.buf, start, self.seq - 1, 0, 0)
+        self.buf[body:body + GLOBALS.size] = globals
+        body += GLOBALS.size
+        self.buf[body:body + len(entity_rows)] = entity_rows
+        body += MAX_ENTITIES * ENTITY_ROW
+        self.buf[body:body + len(bullet_rows)] = bullet_rows
+        SLOT_HEADER.pack_into(self.buf, start, self.seq, entity_count, bullet_count)
+
+        for (category, name), (count, volume) in sounds.items():
+            SOUND.pack_into(self.buf, SOUNDS_START + self.sound_head % SOUND_RING * SOUND.size,
+                            SOUND_IDS.index((category, name)), min(count, 0xffff), round(min(volume, 1) * 255))
+            self.sound_head += 1
+
+        CONTROL.pack_into(self.buf, 0, slot, tick_rate, self.sound_head)
+
+    def read_sounds(self):
+        head = CONTROL.unpack_from(self.buf, 0)[2]
+        first = max(self.read_sound, head - SOUND_RING)
+        sounds = []
+
+        for index in range(first, head):
+            sound_id, count, volume = SOUND.unpack_from(self.buf, SOUNDS_START + index % SOUND_RING * SOUND.size)
+            sounds.append((*SOUND_IDS[sound_id], volume / 255, count))
+
+        overwritten = CONTROL.unpack_from(self.buf, 0)[2] - SOUND_RING - first
+        self.read_sound = head
+        return sounds[max(0, overwritten):]
+
+    def read(self):
+        latest, tick_rate, _ = CONTROL.unpack_from(self.buf, 0)
+        start = CONTROL.size + latest * SLOT_SIZE
+
+        seq, entity_count, bullet_count = SLOT_HEADER.unpack_from(self.buf, start)
+        if seq % 2 or seq <= self.read_seq:
+            return None
+
+        body = start + SLOT_HEADER.size
+        values = GLOBALS.unpack(bytes(self.buf[body:body + GLOBALS.size]))
+        body += GLOBALS.size
+        entities = bytes(self.buf[body:body + entity_count * ENTITY_ROW])
+        body += MAX_ENTITIES * ENTITY_ROW
+        bullets = bytes(self.buf[body:body + bullet_count * BULLET_ROW])
+
+        if SLOT_HEADER.unpack_from(self.buf, start)[0] != seq:
+            return None
+
+        self.read_seq = seq
+        return values, unpack_rows(entities, entity_count, ENTITY.size), \
+            unpack_rows(bullets, bullet_count, BULLET.size), tick_rate
+
+    def close(self):
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+def run_simulation(boom_type, settings, name, inputs):
+    for setting, value in settings.items():
+        setattr(boom_type, setting, value)
+
+    buffer = SnapshotBuffer(name)
+    boom = boom_type(headless=True)
+    if boom.seed is not None:
+        boom.reset(boom.seed)
+    source = SnapshotSource()
+    capture_sounds()
+
+    actions, start = {}, False
+    tick_seconds = game_clock.tick_ms / 1000
+    next_tick = window_start = perf_counter()
+    window_ticks = 0
+    tick_rate = 0
+    running = True
+
+    while running:
+        while True:
+            try:
+                message = inputs.get_nowait()
+            except queue.Empty:
+                break
+            if message is None:
+                running = False
+                break
+            actions, pressed = message
+            start |= pressed
+
+        boom.update(actions, start)
+        start = False
+        buffer.write(encode_globals(boom), *source.snapshot(boom), take_captured_sounds(), tick_rate)
+
+        window_ticks += 1
+        now = perf_counter()
+        if now - window_start >= 1:
+            tick_rate = window_ticks / (now - window_start)
+            window_start, window_ticks = now, 0
+
+        next_tick += tick_seconds
+        if next_tick > now:
+            sleep(next_tick - now)
+        elif now - next_tick > tick_seconds * boom.max_ticks_per_frame:
+            next_tick = now
+
+    boom.scores.flush(background=False)
+    boom.events.close_log()
+    buffer.close()
+
+
+class SplitView:
+    def __init__(self, boom, context="spawn"):
+        context = multiprocessing.get_context(context)
+        settings = {setting: getattr(boom, setting) for setting in SETTINGS}
+
+        self.buffer = SnapshotBuffer()
+        self.inputs = context.Queue()
+        self.process = context.Process(target=run_simulation, daemon=True,
+                                       args=(type(boom), settings, self.buffer.name, self.inputs))
+        self.process.start()
+
+        self.view = SnapshotView()
+        self.last_tick = None
+        self.actions = None
+        self.tick_rate = 0
+        self.font = None
+
+    def begin(self, boom):
+        self.view.begin(boom)
+        boom.scores.persist = False
+        boom.events.close_log()
+
+    def tick(self, boom, actions, start):
+        if start or actions != self.actions:
+            self.inputs.put((actions, start))
+            self.actions = actions
+
+        play_sounds(self.buffer.read_sounds())
+
+        snapshot = self.buffer.read()
+        if snapshot is not None:
+            values, entities, bullets, self.tick_rate = snapshot
+            self.apply(boom, values, entities, bullets)
+
+        flush_sounds()
+        game_clock.advance()
+
+    def apply(self, boom, values, entities, bullets):
+        elapsed = 1 if self.last_tick is None else max(0, values[0] - self.last_tick)
+        self.last_tick = values[0]
+
+        for entity in boom.entities.each():
+            entity.previous_position = Vector2(entity.position)
+        for entity in boom.entities.each("ships", "normal", "slow"):
+            entity.update_health()
+        for _ in range(elapsed):
+            boom.bullets.move()
+
+        self.view.apply(boom, values, entities, bullets)
+        boom.entities.flush()
+
+        boom.scores.submit_score(boom.score)
+        boom.scores.submit_level(boom.level)
+        boom.high_score, boom.highest_level = boom.scores.high_score, boom.scores.highest_level
+
+    def stats(self, fps):
+        return {"sim_ticks_per_sec": self.tick_rate, "render_fps": fps}
+
+    def draw(self, surface, fps):
+        if self.font is None:
+            self.font = texts.font(20)
+
+        text = texts.render(self.font, f"sim {self.tick_rate:.1f} ticks/s  render {fps:.1f} fps", (200, 200, 200))
+        return surface.blit(text, (surface.get_width() - text.get_width() - 10, surface.get_height() - 26))
+
+    def close(self):
+        self.inputs.put(None)
+        self.process.join(5)
+        self.buffer.close()
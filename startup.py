@@ -0,0 +1,23 @@
+from contextlib import contextmanager
+from time import perf_counter
+
+started = perf_counter()
+timings = {}
+
+
+@contextmanager
+def phase(name):
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0) + (perf_counter() - start) * 1000
+
+
+def mark(name):
+    if name not in timings:
+        timings[name] = (perf_counter() - started) * 1000
+
+
+def report():
+    return {name: round(elapsed, 2) for name, elapsed in timings.items()}
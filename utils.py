@@ -1,36 +1,23 @@
+import os
 import random
-import pygame.transform
-from pygame.image import load
+import pygame.draw
 from pygame.math import Vector2
-from pygame import Surface
 from pygame import Color
-from pygame import SRCALPHA
+from assets import registry, texts
 
+rng = random.Random()
 
-def load_sprite(name, with_alpha=True, scale_multi=1):
-    path = f"Assets/{name}.png"
-    loaded_sprite = load(path)
-
-    if scale_multi != 1:
-        x, y = loaded_sprite.get_size()
-        loaded_sprite = pygame.transform.scale(loaded_sprite, (x*scale_multi, y*scale_multi))
 
-    if with_alpha:
-        return loaded_sprite.convert_alpha()
-    else:
-        return loaded_sprite.convert()
+def seed_rng(seed):
+    rng.seed(seed)
 
 
-def load_animated_sprite(name, frame, x, y, scale_multi=1):
-    path = f"Assets/{name}.png"
-    sheet = load(path).convert_alpha()
+def load_sprite(name, with_alpha=True, scale_multi=1):
+    return registry.sprite(name, with_alpha, scale_multi)
 
-    image = Surface((x, y), SRCALPHA).convert_alpha()
-    image.blit(sheet, (0, 0), ((frame * x), 0, x, y))
-    image = pygame.transform.scale(image, (x*scale_multi, y * scale_multi))
-    image.set_colorkey((0,0,0))
 
-    return image.convert_alpha()
+def load_animated_sprite(name, frame, x, y, scale_multi=1):
+    return registry.animated_sprite(name, frame, x, y, scale_multi)
 
 
 def wrap_position(position, surface):
@@ -41,23 +28,23 @@ def wrap_position(position, surface):
 
 def get_random_pos(surface):
     return Vector2(
-        random.randrange(surface.get_width()),
-        random.randrange(surface.get_height())
+        rng.randrange(surface.get_width()),
+        rng.randrange(surface.get_height())
     )
 
 
 def get_random_vel(min_speed, max_speed):
-    speed = random.randint(min_speed, max_speed)
-    angle = random.randint(0, 360)
+    speed = rng.randint(min_speed, max_speed)
+    angle = rng.randint(0, 360)
     return Vector2(speed, 0).rotate(angle)
 
 
 def get_random_time(min_time, max_time):
-    return round(random.uniform(min_time, max_time), 2)
+    return round(rng.uniform(min_time, max_time), 2)
 
 
 def print_text(screen, text, font, center, description, color=Color("snow")):
-    text_surface = font.render(text, True, color)
+    text_surface = texts.render(font, text, color)
     rect = text_surface.get_rect()
 
     if description == 'title':
@@ -74,35 +61,22 @@ def print_text(screen, text, font, center, description, color=Color("snow")):
         rect.center = center
         rect.right = x - 15
 
-    screen.blit(text_surface, rect)
+    return screen.blit(text_surface, rect)
 
 
-def write_high_score(score, score_type):
-    with open('high score.txt', 'r+') as file:
-        data = file.readlines()
-        if score_type == 'score':
-            high_score = int(data[0].replace('\n1', ""))
-
-            if high_score < score:
-                file.seek(0)
-                file.truncate(0)
-                data[0] = str(score) + '\n'
-                file.writelines(data)
-
-        elif score_type == 'level':
-            highest_level = int(data[1])
+def write_atomic(path, text):
+    temporary_path = f"{path}.tmp"
 
-            if highest_level < score:
-                file.seek(0)
-                file.truncate(0)
-                data[1] = str(score)
-                file.writelines(data)
+    with open(temporary_path, 'w') as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
 
-        file.close()
+    os.replace(temporary_path, path)
 
 
-def read_high_score(score_type):
-    with open('high score.txt', 'r') as file:
+def read_high_score(score_type, path='high score.txt'):
+    with open(path, 'r') as file:
         if score_type == 'score':
             return file.readline()
         elif score_type == 'level':
@@ -111,8 +85,7 @@ def read_high_score(score_type):
 
 
 def roll_chance(chance):
-    print(random.randint(1, chance))
-    return random.randint(1, chance) == 1
+    return rng.randint(1, chance) == 1
 
 
 def glow(x, y, color):
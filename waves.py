@@ -0,0 +1,81 @@
+import numpy as np
+from collections import deque
+from math import floor
+from pygame.math import Vector2
+from models import EnemyNormal, EnemySlow
+from utils import rng
+
+ENEMY_TYPES = {
+    "normal": EnemyNormal,
+    "slow": EnemySlow
+}
+
+
+def wave_plan(level):
+    plan = ["normal"] * floor(6 + round(level / 2))
+    if level >= 5:
+        plan += ["slow"] * floor(level - 5)
+    return plan
+
+
+class SpawnSampler:
+    def __init__(self, width, height, cell_size=20, clearance=100):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+
+        xs, ys = np.meshgrid(np.arange(0, width, cell_size), np.arange(0, height, cell_size))
+        self.cells = np.stack((xs.ravel(), ys.ravel()), axis=1)
+        self.centers = self.cells + cell_size / 2
+        self.reach = clearance + cell_size / 2 * 2 ** 0.5
+
+    def valid_cells(self, avoid):
+        valid = np.ones(len(self.cells), dtype=bool)
+
+        for x, y in avoid:
+            delta = self.centers - (x, y)
+            valid &= (delta * delta).sum(axis=1) > self.reach * self.reach
+
+        return np.flatnonzero(valid) if valid.any() else np.arange(len(self.cells))
+
+    def sample(self, count, avoid=()):
+        cells = self.valid_cells(avoid)
+        positions = []
+
+        for _ in range(count):
+            x, y = self.cells[cells[rng.randrange(len(cells))]].tolist()
+            positions.append(Vector2(min(x + rng.randrange(self.cell_size), self.width - 1),
+                                     min(y + rng.randrange(self.cell_size), self.height - 1)))
+
+        return positions
+
+
+class WaveBuilder:
+    def __init__(self, per_tick=2):
+        self.per_tick = per_tick
+        self.level = None
+        self.queue = deque()
+        self.built = []
+
+    def prepare(self, level):
+        self.level = level
+        self.queue = deque(wave_plan(level))
+        self.built = []
+
+    def step(self, budget=None):
+        for _ in range(min(self.per_tick if budget is None else budget, len(self.queue))):
+            enemy_type = self.queue.popleft()
+            self.built.append((enemy_type, ENEMY_TYPES[enemy_type]((0, 0))))
+
+    def ready(self):
+        return self.level is not None and not self.queue
+
+    def take(self, level):
+        if self.level != level:
+            self.prepare(level)
+        self.step(len(self.queue))
+
+        wave = self.built
+        self.level = None
+        self.built = []
+        return wave